@@ -2,6 +2,10 @@
 ASGI config for mysite project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The poll read and vote views are coroutines, so a single worker can keep many
+slow clients waiting without tying up a thread for each. The poll results
+stream (``polls/api/polls/<id>/stream/``) is only usable when the project is
+served through it, e.g. ``uvicorn mysite.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -14,3 +18,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
 
 application = get_asgi_application()
+
+# After the apps are loaded.
+from polls.trending import persist_at_exit  # noqa: E402
+
+persist_at_exit()
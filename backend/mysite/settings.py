@@ -10,7 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
-from decouple import config
+from corsheaders.defaults import default_headers
+from decouple import Csv, config
+import json
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 from datetime import timedelta
 
@@ -48,9 +51,15 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("polls.authentication.CachedJWTAuthentication",),
+    "DEFAULT_THROTTLE_RATES": {
+        "vote_user": config("THROTTLE_VOTE_USER_RATE", default="30/min"),
+        # Per poll: keep it above the rate the vote counter (POLLS_VOTE_COUNTER)
+        # is expected to sustain on a hot poll.
+        "vote_poll": config("THROTTLE_VOTE_POLL_RATE", default="5000/s"),
+        "signup": config("THROTTLE_SIGNUP_RATE", default="5/hour"),
+        "login": config("THROTTLE_LOGIN_RATE", default="10/min"),
+    },
     "DEFAULT_PARSER_CLASSES": (
         "djangorestframework_camel_case.parser.CamelCaseJSONParser",
         "rest_framework.parsers.FormParser",
@@ -67,9 +76,12 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "polls.api.auth.serializers.CachedBlacklistTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "polls.api.auth.serializers.CachedBlacklistTokenBlacklistSerializer",
 }
 
 MIDDLEWARE = [
+    "polls.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -82,6 +94,8 @@ MIDDLEWARE = [
 
 CORS_ALLOWED_ORIGINS = ["http://localhost:5173"]
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 ROOT_URLCONF = "mysite.urls"
 
@@ -105,12 +119,93 @@ WSGI_APPLICATION = "mysite.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# DATABASE_PROFILE picks the backend: "sqlite" (default) for single-node
+# deployments, "postgres" for a client/server database shared by workers. The
+# latter needs psycopg and its pool, from requirements-postgres.txt.
+
+DATABASE_PROFILE = config("DATABASE_PROFILE", default="sqlite")
+
+if DATABASE_PROFILE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DATABASE_NAME", default="polls"),
+            "USER": config("DATABASE_USER", default="polls"),
+            "PASSWORD": config("DATABASE_PASSWORD", default=""),
+            "HOST": config("DATABASE_HOST", default="localhost"),
+            "PORT": config("DATABASE_PORT", default="5432"),
+            "CONN_MAX_AGE": config("DATABASE_CONN_MAX_AGE", default=600, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+    if config("DATABASE_POOL", default=False, cast=bool):
+        # psycopg's connection pool; it replaces persistent connections.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+                "max_size": config("DATABASE_POOL_MAX_SIZE", default=20, cast=int),
+            }
+        }
+elif DATABASE_PROFILE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("DATABASE_NAME", default=str(BASE_DIR / "db.sqlite3")),
+            "OPTIONS": {
+                # Writers wait up to this many seconds for the lock instead of
+                # failing with "database is locked".
+                "timeout": config("DATABASE_BUSY_TIMEOUT", default=20, cast=int),
+                # Take the write lock when the transaction starts, so that two
+                # readers never deadlock while both upgrading to writers.
+                "transaction_mode": "IMMEDIATE",
+                # WAL lets readers proceed while a write is in progress.
+                "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_PROFILE {DATABASE_PROFILE!r}.")
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Read replicas of the default database: file names for the sqlite profile,
+# hosts for postgres. Read-only views query them (see polls.routers).
+
+for index, replica in enumerate(config("DATABASE_REPLICAS", default="", cast=Csv())):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        ("NAME" if DATABASE_PROFILE == "sqlite" else "HOST"): replica,
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["polls.routers.PrimaryReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "polls": {
+        "BACKEND": config(
+            "POLLS_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("POLLS_CACHE_LOCATION", default="polls"),
+    },
+    "idempotency": {
+        "BACKEND": config(
+            "POLLS_IDEMPOTENCY_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("POLLS_IDEMPOTENCY_CACHE_LOCATION", default="idempotency"),
+        "OPTIONS": {
+            "MAX_ENTRIES": config(
+                "POLLS_IDEMPOTENCY_MAX_ENTRIES", default=100_000, cast=int
+            ),
+        },
+    },
 }
 
 
@@ -154,3 +249,135 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Polls
+# Results streaming: broker used to fan vote deltas out to viewers, and the
+# interval (in seconds) at which pending deltas are coalesced and sent.
+
+POLLS_STREAM_BROKER = config(
+    "POLLS_STREAM_BROKER", default="polls.realtime.InProcessBroker"
+)
+POLLS_STREAM_TICK = config("POLLS_STREAM_TICK", default=1.0, cast=float)
+
+# Vote counting strategy (polls.counters): DirectVoteCounter updates the
+# choice row itself; ShardedVoteCounter (option "shards") and
+# BufferedVoteCounter (option "flush_interval") trade exactness of the stored
+# total for less contention on hot polls. Options are given as a JSON object,
+# e.g. {"shards": 16}. THROTTLE_VOTE_POLL_RATE caps the votes a single poll
+# accepts whatever the counter, so raise it along with the counter's capacity.
+
+POLLS_VOTE_COUNTER = config(
+    "POLLS_VOTE_COUNTER", default="polls.counters.DirectVoteCounter"
+)
+POLLS_VOTE_COUNTER_OPTIONS = config(
+    "POLLS_VOTE_COUNTER_OPTIONS", default="{}", cast=json.loads
+)
+
+# Cache alias holding serialized polls, and how long (in seconds) the entry of
+# a poll still open for voting may be served. Expired polls are cached until
+# evicted. finalize_polls only warms the entries of the polls it finalizes if
+# POLLS_CACHE_BACKEND is shared with the web processes (not LocMemCache).
+
+POLLS_CACHE = "polls"
+POLLS_CACHE_ACTIVE_TIMEOUT = config("POLLS_CACHE_ACTIVE_TIMEOUT", default=60, cast=int)
+
+# How long (in seconds) a user's stats summary is trusted before being
+# recomputed, bounding drift from concurrent incremental updates.
+
+POLLS_USER_STATS_TIMEOUT = config("POLLS_USER_STATS_TIMEOUT", default=3600, cast=int)
+
+# Share of requests (0 to 1) timed by polls.middleware.InstrumentationMiddleware.
+
+POLLS_METRICS_SAMPLE_RATE = config("POLLS_METRICS_SAMPLE_RATE", default=1.0, cast=float)
+
+# Most polls a single bulk creation request may contain.
+
+POLLS_BULK_CREATE_MAX_POLLS = config(
+    "POLLS_BULK_CREATE_MAX_POLLS", default=500, cast=int
+)
+
+# How long (in seconds) a user's reads stay on the primary database after they
+# voted or created polls, so they see their own writes despite replica lag.
+# Pins live in the polls cache: with several processes, POLLS_CACHE_BACKEND
+# must be shared by all of them for a pin to hold across processes.
+
+POLLS_REPLICA_PIN_SECONDS = config("POLLS_REPLICA_PIN_SECONDS", default=10, cast=int)
+
+# How long (in seconds) polls.authentication.CachedJWTAuthentication may serve
+# a user from cache instead of the database, and the longest it goes without
+# picking up tokens blacklisted by other processes.
+
+POLLS_AUTH_USER_CACHE_TIMEOUT = config(
+    "POLLS_AUTH_USER_CACHE_TIMEOUT", default=60, cast=int
+)
+POLLS_JWT_BLACKLIST_REFRESH_INTERVAL = config(
+    "POLLS_JWT_BLACKLIST_REFRESH_INTERVAL", default=5, cast=float
+)
+
+# Where the token buckets of polls.throttling live: in process memory
+# (InMemoryBucketStore) or in the polls cache, shared between processes
+# (CacheBucketStore). Rates are set in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].
+
+POLLS_THROTTLE_STORE = config(
+    "POLLS_THROTTLE_STORE", default="polls.throttling.InMemoryBucketStore"
+)
+POLLS_THROTTLE_STORE_OPTIONS = {}
+
+# Directory of the append-only vote log (polls.votelog), written to by every
+# vote once set, and its segment size in bytes.
+
+POLLS_VOTE_LOG_DIR = config("POLLS_VOTE_LOG_DIR", default="")
+POLLS_VOTE_LOG_SEGMENT_SIZE = config(
+    "POLLS_VOTE_LOG_SEGMENT_SIZE", default=64 * 1024 * 1024, cast=int
+)
+
+# Votes fetched per query (and written per chunk) by the vote export endpoint.
+
+POLLS_EXPORT_CHUNK_SIZE = config("POLLS_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Polls are finalized (see polls.expiry and the finalize_polls command) this
+# many seconds after their deadline, letting votes in flight commit first,
+# and at most this many per transaction.
+
+POLLS_FINALIZE_GRACE_SECONDS = config(
+    "POLLS_FINALIZE_GRACE_SECONDS", default=5, cast=int
+)
+POLLS_FINALIZE_BATCH_SIZE = config("POLLS_FINALIZE_BATCH_SIZE", default=500, cast=int)
+
+# Trending polls (polls.trending): the half-life (in seconds) of a ballot's
+# weight, how many polls each process keeps ranked, and how often (in
+# seconds) it persists the ballots it saw and reloads its ranking. Scores
+# persisted under another half-life are not rescaled.
+
+POLLS_TRENDING_HALF_LIFE = config("POLLS_TRENDING_HALF_LIFE", default=3600, cast=float)
+POLLS_TRENDING_SIZE = config("POLLS_TRENDING_SIZE", default=1000, cast=int)
+POLLS_TRENDING_SYNC_INTERVAL = config(
+    "POLLS_TRENDING_SYNC_INTERVAL", default=10, cast=float
+)
+
+# Poll search (polls.search): the backend class, picked automatically when
+# empty (SQLite FTS5 where available, else an inverted index table), and the
+# most results a query may page through.
+
+POLLS_SEARCH_BACKEND = config("POLLS_SEARCH_BACKEND", default="")
+POLLS_SEARCH_MAX_RESULTS = config("POLLS_SEARCH_MAX_RESULTS", default=1000, cast=int)
+
+# Cache alias keeping the responses of vote and create requests sent with an
+# Idempotency-Key header (see polls.idempotency), and how long (in seconds) a
+# retry carrying the same key gets the stored response back. The alias's
+# MAX_ENTRIES bounds how many keys are remembered.
+
+POLLS_IDEMPOTENCY_CACHE = "idempotency"
+POLLS_IDEMPOTENCY_TTL = config("POLLS_IDEMPOTENCY_TTL", default=86400, cast=int)
+
+# How long (in seconds) vote histograms (see polls.histograms) keep minute
+# buckets before compact_vote_histograms folds them into hour buckets, and
+# hour buckets before they are folded into day buckets.
+
+POLLS_HISTOGRAM_MINUTE_RETENTION = config(
+    "POLLS_HISTOGRAM_MINUTE_RETENTION", default=86400, cast=int
+)
+POLLS_HISTOGRAM_HOUR_RETENTION = config(
+    "POLLS_HISTOGRAM_HOUR_RETENTION", default=30 * 86400, cast=int
+)
@@ -0,0 +1,15 @@
+"""
+Django settings used by ``manage.py test``: the regular settings, running on an
+in-memory SQLite database with a fast password hasher.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
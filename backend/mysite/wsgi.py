@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
 
 application = get_wsgi_application()
+
+# After the apps are loaded.
+from polls.trending import persist_at_exit  # noqa: E402
+
+persist_at_exit()
@@ -1,2 +1,6 @@
 from .signup_serializer import SignupSerializer
 from .user_serializer import UserSerializer
+from .token_serializers import (
+    CachedBlacklistTokenBlacklistSerializer,
+    CachedBlacklistTokenRefreshSerializer,
+)
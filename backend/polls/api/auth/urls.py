@@ -7,10 +7,15 @@ from rest_framework_simplejwt.views import (
 )
 
 from . import views
+from polls.throttling import LoginRateThrottle
 
 urlpatterns = [
     path("signup/", views.signup, name="signup"),
-    path("login/", TokenObtainPairView.as_view(), name="login"),
+    path(
+        "login/",
+        TokenObtainPairView.as_view(throttle_classes=[LoginRateThrottle]),
+        name="login",
+    ),
     path("refresh_token/", TokenRefreshView.as_view(), name="refresh_token"),
     path("verify_token/", TokenVerifyView.as_view(), name="verify_token"),
     path("whoami/", views.whoami, name="whoami"),
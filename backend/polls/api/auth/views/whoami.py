@@ -1,9 +1,11 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from ..serializers import UserSerializer
+from polls.routers import read_from_replica
 
 
 @api_view(["GET"])
+@read_from_replica
 def whoami(request):
     serializer = UserSerializer(request.user)
 
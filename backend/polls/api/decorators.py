@@ -0,0 +1,108 @@
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework import exceptions
+from rest_framework.decorators import api_view
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` whose handlers are coroutines, dispatched without leaving the
+    event loop. Authenticators may provide an ``aauthenticate`` coroutine;
+    those that don't are run in a thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.initial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def initial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.perform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def perform_authentication(self, request):
+        # Request._authenticate, awaiting each authenticator.
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, "aauthenticate", None) or (
+                sync_to_async(authenticator.authenticate)
+            )
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+
+def async_api_view(http_method_names):
+    """
+    Counterpart of DRF's ``api_view`` for ``async def`` views. Honours the
+    same ``permission_classes``/``renderer_classes``/... decorators.
+    """
+
+    def decorator(func):
+        # Let api_view collect the policy attributes set by the other
+        # decorators, then rebuild the view on top of AsyncAPIView.
+        WrappedAPIView = api_view(http_method_names)(func).cls
+
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        AsyncWrappedAPIView = type(
+            "AsyncWrappedAPIView",
+            (AsyncAPIView, WrappedAPIView),
+            {
+                "__doc__": func.__doc__,
+                "__module__": func.__module__,
+                **{method.lower(): handler for method in http_method_names},
+            },
+        )
+        AsyncWrappedAPIView.__name__ = func.__name__
+        return AsyncWrappedAPIView.as_view()
+
+    return decorator
+
+
+def served_over_asgi(request):
+    """Whether ``request`` (Django's or DRF's) came in through ASGI."""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
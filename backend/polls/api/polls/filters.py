@@ -0,0 +1,44 @@
+import django_filters
+from django.db.models import Q
+from django.utils import timezone
+
+from polls.models import Poll
+from polls.search import get_search_backend, parse_query
+
+
+class PollFilter(django_filters.FilterSet):
+    status = django_filters.ChoiceFilter(
+        choices=Poll.Status.choices,
+        method="filter_status",
+    )
+    owner = django_filters.CharFilter(field_name="user__username")
+    search = django_filters.CharFilter(method="filter_search")
+    # Applied by PollCursorPagination, which owns the ordering.
+    sort = django_filters.ChoiceFilter(
+        choices=[("newest", "Newest first"), ("popular", "Most votes first")],
+        method="filter_sort",
+    )
+
+    class Meta:
+        model = Poll
+        fields = ["status", "owner", "search", "sort"]
+
+    def filter_status(self, queryset, name, value):
+        # The stored status lags the deadline until polls.expiry finalizes
+        # the poll, or for as long as finalize_polls is not running.
+        now = timezone.now()
+        if value == Poll.Status.ACTIVE:
+            # Negated so that SQLite keeps walking the (status, created_at)
+            # index in page order rather than sorting every active poll.
+            return queryset.filter(status=value).exclude(deadline__lte=now)
+        return queryset.filter(Q(status=value) | Q(deadline__lte=now))
+
+    def filter_search(self, queryset, name, value):
+        # Same matching as the search endpoint, through its index.
+        terms = parse_query(value)
+        if not terms:
+            return queryset.none()
+        return get_search_backend().filter(queryset, terms)
+
+    def filter_sort(self, queryset, name, value):
+        return queryset
@@ -0,0 +1,92 @@
+"""
+Read-only fast path for poll listings.
+
+Produces exactly the JSON ``PollSerializer`` + ``CamelCaseJSONRenderer`` would,
+but from ``.values()`` rows with the camelCase keys spelled out up front, so
+that neither DRF's per-field machinery nor the recursive key renaming run for
+every poll.
+"""
+
+import json
+
+from django.http import HttpResponse
+from django.utils import timezone
+
+from polls.counters import get_vote_counter
+
+POLL_VALUES = (
+    "id",
+    "user__username",
+    "question",
+    "description",
+    "allows_multiple_choices",
+    "created_at",
+    "deadline",
+    "results",
+    "total_votes",
+    "unique_voters",
+)
+CHOICE_VALUES = ("id", "vote_count", "pending_vote_count", "choice_txt", "poll_id")
+
+
+def format_datetime(value):
+    # Same output as DRF's DateTimeField with the default ISO 8601 format.
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def serialize_polls(polls):
+    """Represent poll rows (``Poll.objects.values(*POLL_VALUES)``)."""
+    polls = list(polls)
+    choice_sets = {poll["id"]: [] for poll in polls}
+    choices = (
+        get_vote_counter()
+        .choices()
+        .filter(poll_id__in=choice_sets)
+        .order_by("pk")
+        .values_list(*CHOICE_VALUES)
+    )
+    results = {poll["id"]: poll["results"] for poll in polls}
+    for choice_id, vote_count, pending, choice_txt, poll_id in choices:
+        final = results[poll_id]
+        choice_sets[poll_id].append(
+            {
+                "id": choice_id,
+                "voteCount": (
+                    vote_count + pending if final is None else final[str(choice_id)]
+                ),
+                "choiceTxt": choice_txt,
+                "poll": poll_id,
+            }
+        )
+
+    now = timezone.now()
+    return [
+        {
+            "id": poll["id"],
+            "choiceSet": choice_sets[poll["id"]],
+            "user": poll["user__username"],
+            "isActive": poll["results"] is None and poll["deadline"] > now,
+            "question": poll["question"],
+            "description": poll["description"],
+            "allowsMultipleChoices": poll["allows_multiple_choices"],
+            "createdAt": format_datetime(poll["created_at"]),
+            "deadline": format_datetime(poll["deadline"]),
+            "totalVotes": poll["total_votes"],
+            "uniqueVoters": poll["unique_voters"],
+        }
+        for poll in polls
+    ]
+
+
+def render_json(data):
+    # Matches DRF's JSONRenderer defaults (UNICODE_JSON, COMPACT_JSON).
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(render_json(data), **kwargs)
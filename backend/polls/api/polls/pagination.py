@@ -0,0 +1,169 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from polls.models import Poll
+
+
+class PollCursorPagination(BasePagination):
+    """
+    Keyset pagination over ``?sort``'s ordering, newest or most voted first.
+    Cursors hold the values of every ordering field of the row they follow,
+    ties included, where DRF's CursorPagination positions on the first field
+    only and pages through ties with an offset capped at 1000.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    sort_query_param = "sort"
+    # Validated by PollFilter. Every field is in descending order, the last
+    # one unique.
+    orderings = {
+        "newest": ("created_at", "id"),
+        "popular": ("total_votes", "id"),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fields = self.get_ordering(request)
+        size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        order = self.fields if reverse else [f"-{field}" for field in self.fields]
+        if position is not None:
+            queryset = queryset.filter(
+                _beyond(self.fields, position, "gt" if reverse else "lt")
+            )
+        page = list(queryset.order_by(*order)[: size + 1])
+        has_more = len(page) > size
+        page = page[:size]
+        if reverse:
+            page.reverse()
+
+        # Coming back from a later page, there is always a next one.
+        self.has_next = has_more or (reverse and position is not None)
+        self.has_previous = has_more if reverse else position is not None
+        self.page = page
+        return page
+
+    def get_ordering(self, request):
+        sort = request.query_params.get(self.sort_query_param, "newest")
+        return self.orderings.get(sort, self.orderings["newest"])
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        # Datetimes in full: DjangoJSONEncoder would cut them to milliseconds.
+        position = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in (_value(row, field) for field in self.fields)
+        ]
+        cursor = json.dumps([reverse, *position])
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            urlsafe_b64encode(cursor.encode()).decode(),
+        )
+
+    def decode_cursor(self, request):
+        """``(position, reverse)`` of the requested cursor, if any."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None, False
+        try:
+            reverse, *position = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(position) != len(self.fields):
+                raise ValueError
+            position = [
+                Poll._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound("Invalid cursor")
+        return position, bool(reverse)
+
+
+def _value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def _beyond(fields, position, lookup):
+    """
+    Rows past ``position`` in the order of ``fields``, ``lookup`` being "lt"
+    going down. Spelled as ``a <= x AND (a < x OR ...)`` so that the leading
+    bound can seek the ordering's index.
+    """
+    field, value = fields[0], position[0]
+    if len(fields) == 1:
+        return Q(**{f"{field}__{lookup}": value})
+    return Q(**{f"{field}__{lookup}e": value}) & (
+        Q(**{f"{field}__{lookup}": value}) | _beyond(fields[1:], position[1:], lookup)
+    )
+
+
+class SearchPagination(BasePagination):
+    """
+    Numbered pages of ranked search results. Matches are not counted: one
+    more result than the page holds is fetched to tell whether another page
+    follows.
+    """
+
+    page_size = 20
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_search(self, search, request):
+        """Page through ``search(offset, limit)``, which returns a list."""
+        self.request = request
+        try:
+            self.page = int(request.query_params.get(self.page_query_param, 1))
+            size = int(request.query_params.get(self.page_size_query_param, 0))
+        except ValueError:
+            raise NotFound("Invalid page.")
+        if self.page < 1:
+            raise NotFound("Invalid page.")
+        if size < 1:
+            size = self.page_size
+        size = min(size, self.max_page_size)
+
+        results = search((self.page - 1) * size, size + 1)
+        self.has_next = len(results) > size
+        return results[:size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
@@ -1,9 +1,11 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import IntegerField, ModelSerializer
 
 from polls.models import Choice
 
 
 class ChoiceSerializer(ModelSerializer):
+    vote_count = IntegerField(source="current_vote_count", read_only=True)
+
     class Meta:
         model = Choice
         fields = "__all__"
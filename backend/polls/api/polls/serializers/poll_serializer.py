@@ -1,7 +1,49 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from polls.models.choice import Choice
 from . import ChoiceSerializer
 from polls.models import Poll
+from polls.signals import polls_created
+
+
+def _create_polls(polls_data):
+    """
+    Insert polls and all their choices with one bulk INSERT each, and attach
+    the created choices to their polls as if prefetched, so that neither
+    serializing them nor the ``polls_created`` receivers query them again.
+    """
+    choices_data = [poll_data.pop("choice_set") for poll_data in polls_data]
+
+    with transaction.atomic():
+        polls = Poll.objects.bulk_create(Poll(**poll_data) for poll_data in polls_data)
+        choices = Choice.objects.bulk_create(
+            Choice(poll=poll, **choice_data)
+            for poll, poll_choices in zip(polls, choices_data)
+            for choice_data in poll_choices
+        )
+        choices_by_poll = {poll.id: [] for poll in polls}
+        for choice in choices:
+            choices_by_poll[choice.poll_id].append(choice)
+        for poll in polls:
+            _prefetched(poll, "choice_set", choices_by_poll[poll.id])
+        transaction.on_commit(lambda: polls_created.send(sender=Poll, polls=polls))
+
+    return polls
+
+
+def _prefetched(instance, name, objects):
+    # What prefetch_related_objects() stores for a related manager, from
+    # objects at hand rather than a query.
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = objects
+    queryset._prefetch_done = True
+    instance.__dict__.setdefault("_prefetched_objects_cache", {})[name] = queryset
+
+
+class PollListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        return _create_polls(validated_data)
 
 
 class PollSerializer(serializers.ModelSerializer):
@@ -11,14 +53,23 @@ class PollSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Poll
-        fields = "__all__"
+        exclude = ["status", "results", "trending_score"]
         read_only_fields = ["user", "created_at", "is_active"]
+        list_serializer_class = PollListSerializer
 
-    def create(self, validated_data):
-        choices_data = validated_data.pop("choice_set")
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.results is not None:
+            # Finalized poll: report the frozen counts.
+            for choice in data["choice_set"]:
+                choice["vote_count"] = instance.results[str(choice["id"])]
+        return data
 
-        poll = Poll.objects.create(**validated_data)
-        for choice_data in choices_data:
-            Choice.objects.create(poll=poll, **choice_data)
+    def validate_deadline(self, value):
+        if value <= timezone.now():
+            raise serializers.ValidationError("The deadline must be in the future.")
+        return value
 
+    def create(self, validated_data):
+        (poll,) = _create_polls([validated_data])
         return poll
@@ -1,35 +1,127 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from polls.counters import get_vote_counter
 from polls.models.choice import Choice
+from polls.models.poll import Poll
 from polls.models.vote import Vote
-from polls.models import Poll
-from django.db.models import F
+from polls.signals import votes_cast
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+ALREADY_VOTED = "You have already voted on this poll!"
+
+
+class VoteListSerializer(serializers.ListSerializer):
+    """
+    Validates and records a whole ballot at once: a constant number of
+    queries whatever the number of choices, all inside one transaction.
+    """
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Select at least one choice.")
+
+        poll_ids = {vote["poll_id"] for vote in attrs}
+        if len(poll_ids) > 1:
+            raise serializers.ValidationError("A ballot can only target one poll.")
+        (poll_id,) = poll_ids
+
+        choice_ids = [vote["choice_id"] for vote in attrs]
+        if len(set(choice_ids)) != len(choice_ids):
+            raise serializers.ValidationError("Each choice can only be voted once.")
+
+        # The poll's choices that are either on the ballot or already voted
+        # on by the user, with the poll's state: a single query.
+        user = self.context["request"].user
+        rows = list(
+            Choice.objects.filter(poll_id=poll_id)
+            .annotate(
+                voted=Exists(
+                    Vote.objects.filter(
+                        user=user, poll_id=poll_id, choice=OuterRef("pk")
+                    )
+                )
+            )
+            .filter(Q(id__in=choice_ids) | Q(voted=True))
+            .values_list(
+                "id",
+                "voted",
+                "poll__status",
+                "poll__deadline",
+                "poll__allows_multiple_choices",
+            )
+        )
+        if not set(choice_ids) <= {choice_id for choice_id, *_ in rows}:
+            raise serializers.ValidationError("Invalid choice for this poll.")
+
+        _, _, status, deadline, allows_multiple_choices = rows[0]
+        if status != Poll.Status.ACTIVE or deadline <= timezone.now():
+            raise serializers.ValidationError("This poll has ended.")
+
+        voted = {choice_id for choice_id, was_voted, *_ in rows if was_voted}
+        if not allows_multiple_choices and len(choice_ids) > 1:
+            raise serializers.ValidationError("This poll only allows one choice.")
+        if voted.intersection(choice_ids) or (voted and not allows_multiple_choices):
+            raise serializers.ValidationError(ALREADY_VOTED)
+        # Whether this may be the user's first ballot; the database has the
+        # last word, as a concurrent one may get there first.
+        self.new_voter = not voted
+        self.single_choice = not allows_multiple_choices
+
+        return attrs
+
+    def create(self, validated_data):
+        # First as the user's first ballot, counting them as a new voter,
+        # then, if a concurrent first ballot won, as a later one.
+        for first_ballot in (True, False) if self.new_voter else (False,):
+            try:
+                return self._record(validated_data, first_ballot)
+            except IntegrityError:
+                # A concurrent ballot of the same user was recorded since
+                # validation: the unique constraints on votes settle the race.
+                continue
+        raise serializers.ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [ALREADY_VOTED]}
+        )
+
+    def _record(self, validated_data, first_ballot):
+        poll_id = validated_data[0]["poll_id"]
+        user_id = validated_data[0]["user"].id
+        choice_ids = [vote["choice_id"] for vote in validated_data]
+
+        with transaction.atomic():
+            votes = Vote.objects.bulk_create(
+                Vote(
+                    **vote,
+                    single_choice=self.single_choice,
+                    first_ballot=first_ballot and i == 0,
+                )
+                for i, vote in enumerate(validated_data)
+            )
+            get_vote_counter().increment(poll_id, choice_ids, new_voter=first_ballot)
+            transaction.on_commit(
+                lambda: votes_cast.send(
+                    sender=Vote,
+                    poll_id=poll_id,
+                    user_id=user_id,
+                    choice_ids=choice_ids,
+                )
+            )
+        return votes
 
 
 class VoteSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    poll = serializers.IntegerField(source="poll_id")
+    choice = serializers.IntegerField(source="choice_id")
 
     class Meta:
         model = Vote
         fields = "__all__"
+        list_serializer_class = VoteListSerializer
 
     def validate(self, attrs):
         attrs["user"] = self.context["request"].user
-        user = attrs["user"]
-        poll = attrs["poll"]
-        choice = attrs["choice"]
-
-        if Vote.objects.filter(user=user, poll=poll, choice=choice).exists():
-            raise serializers.ValidationError("You have already voted on this poll!")
 
         return super().validate(attrs)
-
-    def create(self, validated_data):
-        vote = super().create(validated_data)
-
-        Choice.objects.filter(id=vote.choice.id).update(vote_count=F("vote_count") + 1)
-
-        return vote
-
-    def delete(self, *args, **kwargs):
-        Choice.objects.filter(pk=self.choice_id).update(vote_count=F("vote_count") - 1)
-        super().delete(*args, **kwargs)
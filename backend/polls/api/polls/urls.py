@@ -5,6 +5,12 @@ from . import views
 urlpatterns = [
     path("", views.get_polls, name="get_polls"),
     path("<int:id>/", views.get_poll, name="get_poll"),
+    path("trending/", views.get_trending_polls, name="get_trending_polls"),
+    path("search/", views.search_polls, name="search_polls"),
     path("create/", views.create, name="create"),
+    path("bulk_create/", views.bulk_create, name="bulk_create"),
     path("vote/", views.vote, name="vote"),
+    path("<int:id>/stream/", views.stream_poll, name="stream_poll"),
+    path("<int:id>/export/", views.export_votes, name="export_votes"),
+    path("<int:id>/histogram/", views.get_vote_histogram, name="get_vote_histogram"),
 ]
@@ -1,4 +1,10 @@
 from .poll import get_poll
 from .polls import get_polls
 from .create import create
+from .bulk_create import bulk_create
 from .vote import vote
+from .stream import stream_poll
+from .export import export_votes
+from .trending import get_trending_polls
+from .search import search_polls
+from .histogram import get_vote_histogram
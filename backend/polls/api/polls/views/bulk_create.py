@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+
+from polls.idempotency import idempotent
+from ..serializers import PollSerializer
+
+
+@api_view(["POST"])
+@idempotent
+def bulk_create(request):
+    deserializedNewPolls = PollSerializer(
+        data=request.data,
+        many=True,
+        allow_empty=False,
+        max_length=settings.POLLS_BULK_CREATE_MAX_POLLS,
+    )
+
+    if deserializedNewPolls.is_valid():
+        deserializedNewPolls.save(user=request.user)
+        return Response(
+            deserializedNewPolls.data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    return Response(deserializedNewPolls.errors, status=status.HTTP_400_BAD_REQUEST)
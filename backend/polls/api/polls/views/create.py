@@ -2,16 +2,20 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
+from polls.cache import cache_poll
+from polls.idempotency import idempotent
 from ..serializers import PollSerializer
 
 
 @api_view(["POST"])
+@idempotent
 def create(request):
     deserializedNewPoll = PollSerializer(data=request.data)
 
     if deserializedNewPoll.is_valid():
         deserializedNewPoll = deserializedNewPoll.save(user=request.user)
         serializedNewPoll = PollSerializer(deserializedNewPoll)
+        cache_poll(deserializedNewPoll, serializedNewPoll.data)
         return Response(
             serializedNewPoll.data,
             status=status.HTTP_201_CREATED,
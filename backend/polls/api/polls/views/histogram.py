@@ -0,0 +1,50 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
+from ..listing import format_datetime
+from polls.api.decorators import async_api_view
+from polls.histograms import vote_histogram
+from polls.models import Poll, VoteBucket
+from polls.routers import read_from_replica
+
+
+@async_api_view(["GET"])
+@read_from_replica
+async def get_vote_histogram(request, id: int):
+    """
+    The votes each choice of a poll received per ``?resolution`` (minute,
+    hour by default, or day), for its owner. Only buckets with votes are
+    listed, oldest first.
+    """
+    resolution = request.query_params.get("resolution", VoteBucket.Resolution.HOUR)
+    if resolution not in VoteBucket.Resolution.values:
+        return Response(
+            {"resolution": ['Expected "minute", "hour" or "day".']},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        poll = await Poll.objects.only("user_id").aget(pk=id)
+    except Poll.DoesNotExist:
+        raise Http404("No Poll matches the given query.")
+    if poll.user_id != request.user.id:
+        raise PermissionDenied("Only the poll's owner can see its vote histogram.")
+
+    histogram = await sync_to_async(vote_histogram)(id, resolution)
+    return Response(
+        {
+            "resolution": resolution,
+            "buckets": [
+                {
+                    "start": format_datetime(start),
+                    "counts": {
+                        str(choice_id): count for choice_id, count in counts.items()
+                    },
+                }
+                for start, counts in histogram
+            ],
+        }
+    )
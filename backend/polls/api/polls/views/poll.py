@@ -1,13 +1,38 @@
-from rest_framework.decorators import api_view, permission_classes
+from django.http import Http404
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.decorators import permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from ..serializers import PollSerializer
+from polls.api.decorators import async_api_view
+from polls.cache import acache_poll, aget_cached_poll
+from polls.counters import prefetch_choices
 from polls.models import Poll
 
 
-@api_view(["GET"])
+# Not read_from_replica: misses fill the cache shared by every user, which
+# must not hold a replica's lagging copy of the poll.
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_poll(request, id: int):
-    poll = Poll.objects.prefetch_related("choice_set").get(pk=id)
-    serializedPoll = PollSerializer(poll)
-    return Response(serializedPoll.data)
+async def get_poll(request, id: int):
+    cached = await aget_cached_poll(id)
+    if cached is None:
+        try:
+            poll = await (
+                Poll.objects.select_related("user")
+                .prefetch_related(prefetch_choices())
+                .aget(pk=id)
+            )
+        except Poll.DoesNotExist:
+            raise Http404("No Poll matches the given query.")
+        serializedPoll = PollSerializer(poll).data
+        etag = await acache_poll(poll, serializedPoll)
+    else:
+        etag, serializedPoll = cached
+
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return Response(serializedPoll, headers={"ETag": etag})
@@ -1,13 +1,33 @@
-from rest_framework.decorators import api_view, permission_classes
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.decorators import permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from ..serializers import PollSerializer
+from ..filters import PollFilter
+from ..listing import POLL_VALUES, FastJSONResponse, serialize_polls
+from ..pagination import PollCursorPagination
+from polls.api.decorators import async_api_view
 from polls.models import Poll
+from polls.routers import read_from_replica
 
 
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def get_polls(request):
-    polls = Poll.objects.all().prefetch_related("choice_set").order_by("-created_at")
-    serializedPolls = PollSerializer(polls, many=True)
-    return Response(serializedPolls.data)
+@read_from_replica
+async def get_polls(request):
+    polls = PollFilter(request.query_params, queryset=Poll.objects.all())
+    if not polls.is_valid():
+        return Response(polls.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    paginator = PollCursorPagination()
+    return FastJSONResponse(await sync_to_async(_page)(paginator, polls.qs, request))
+
+
+def _page(paginator, polls, request):
+    # Pagination and the choices lookup query in a single trip to a thread.
+    page = paginator.paginate_queryset(polls.values(*POLL_VALUES), request)
+    return {
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        "results": serialize_polls(page),
+    }
@@ -0,0 +1,48 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from ..listing import POLL_VALUES, FastJSONResponse, serialize_polls
+from ..pagination import SearchPagination
+from polls.api.decorators import async_api_view
+from polls.models import Poll
+from polls.routers import read_from_replica
+from polls.search import get_search_backend, parse_query
+
+
+@async_api_view(["GET"])
+@permission_classes([AllowAny])
+@read_from_replica
+async def search_polls(request):
+    """
+    Polls whose question or choices match the words of ``?q`` (see
+    polls.search), best match first, a ``?page`` at a time.
+    """
+    terms = parse_query(request.query_params.get("q", ""))
+    if not terms:
+        return Response(
+            {"q": ["Enter at least one word to search for."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    paginator = SearchPagination()
+    return FastJSONResponse(await sync_to_async(_page)(paginator, terms, request))
+
+
+def _page(paginator, terms, request):
+    search = partial(get_search_backend().search, terms)
+    poll_ids = paginator.paginate_search(search, request)
+    polls = Poll.objects.filter(id__in=poll_ids).values(*POLL_VALUES)
+    by_id = {poll["id"]: poll for poll in polls}
+    return {
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        # Polls deleted since they were indexed are skipped.
+        "results": serialize_polls(
+            by_id[poll_id] for poll_id in poll_ids if poll_id in by_id
+        ),
+    }
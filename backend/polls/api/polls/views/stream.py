@@ -0,0 +1,58 @@
+import json
+from contextlib import aclosing
+
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+
+from polls.api.decorators import served_over_asgi
+from polls.counters import get_vote_counter
+from polls.realtime import get_broker
+
+
+async def stream_poll(request, id: int):
+    """
+    Server-sent events feed of a poll's vote counts: one ``snapshot`` event
+    with the current counts, then ``delta`` events with the increments
+    gathered during each broker tick. Needs to be served through ASGI; under
+    WSGI the response would hold a worker forever without sending anything.
+    """
+    if not served_over_asgi(request):
+        return JsonResponse(
+            {"detail": "Results streaming needs the app to be served over ASGI."},
+            status=501,
+        )
+
+    # Subscribe before reading the snapshot, so that no delta is lost in
+    # between; one landing while it is read may be counted twice until the
+    # client reconnects.
+    messages = get_broker().subscribe(id)
+    try:
+        choices = {
+            str(choice.id): choice.current_vote_count
+            async for choice in get_vote_counter().choices().filter(poll_id=id)
+        }
+        if not choices:
+            raise Http404("No Poll matches the given query.")
+    except BaseException:
+        await messages.aclose()
+        raise
+
+    response = StreamingHttpResponse(
+        _events(id, choices, messages), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _events(poll_id, choices, messages):
+    async with aclosing(messages):
+        yield _event("snapshot", json.dumps({"poll": poll_id, "choices": choices}))
+        async for message in messages:
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield _event("delta", message)
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {data}\n\n"
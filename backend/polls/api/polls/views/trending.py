@@ -0,0 +1,63 @@
+import itertools
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from ..listing import POLL_VALUES, FastJSONResponse, serialize_polls
+from polls.api.decorators import async_api_view
+from polls.models import Poll
+from polls.routers import read_from_replica
+from polls.trending import get_trending_ranking
+
+MAX_LIMIT = 100
+
+
+@async_api_view(["GET"])
+@permission_classes([AllowAny])
+@read_from_replica
+async def get_trending_polls(request):
+    """
+    The ``?limit`` (20 by default) active polls with the most recent ballots,
+    best first, each ballot's weight halving every POLLS_TRENDING_HALF_LIFE
+    seconds.
+    """
+    try:
+        limit = int(request.query_params.get("limit", 20))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        return Response(
+            {"limit": [f"Expected a number between 1 and {MAX_LIMIT}."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return FastJSONResponse(await sync_to_async(_trending)(limit))
+
+
+def _trending(limit):
+    ranking = get_trending_ranking()
+    now = timezone.now()
+    polls, seen = [], set()
+    # Ranked polls may have ended since their last ballot: look further down
+    # the ranking until enough active ones are found.
+    for start in itertools.count(0, limit):
+        ranked = ranking.top(limit, start)
+        if not ranked:
+            break
+        # The ranking may have moved since the previous batch.
+        batch = [poll_id for poll_id, _ in ranked if poll_id not in seen]
+        seen.update(batch)
+        found = {
+            poll["id"]: poll
+            for poll in Poll.objects.filter(
+                id__in=batch, status=Poll.Status.ACTIVE, deadline__gt=now
+            ).values(*POLL_VALUES)
+        }
+        polls.extend(found[poll_id] for poll_id in batch if poll_id in found)
+        if len(polls) >= limit:
+            break
+    return serialize_polls(polls[:limit])
@@ -1,26 +1,33 @@
+from asgiref.sync import sync_to_async
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import throttle_classes
 from rest_framework.response import Response
 
+from polls.api.decorators import async_api_view
+from polls.counters import prefetch_choices
+from polls.idempotency import idempotent
 from polls.models.poll import Poll
+from polls.throttling import VoteRateThrottle
 from ..serializers import VoteSerializer, PollSerializer
 
 
-@api_view(["POST"])
-def vote(request):
-    serializers = [
-        VoteSerializer(data=vote, context={"request": request}) for vote in request.data
-    ]
+@async_api_view(["POST"])
+@throttle_classes([VoteRateThrottle])
+@idempotent
+async def vote(request):
+    serializer = VoteSerializer(
+        data=request.data, many=True, context={"request": request}
+    )
 
-    are_valid = True
-    for serializer in serializers:
-        if not serializer.is_valid():
-            are_valid = False
-            break
-    if are_valid:
-        for serializer in serializers:
-            vote = serializer.save()
-        poll = Poll.objects.get(id=vote.poll.id)
+    # Validation queries and the vote transaction stay synchronous: atomic
+    # blocks cannot span awaits.
+    if await sync_to_async(serializer.is_valid)():
+        votes = await sync_to_async(serializer.save)()
+        poll = await (
+            Poll.objects.select_related("user")
+            .prefetch_related(prefetch_choices())
+            .aget(id=votes[0].poll_id)
+        )
         serializedPoll = PollSerializer(poll)
         return Response(
             serializedPoll.data,
@@ -5,4 +5,5 @@ urlpatterns = [
     path("polls/", include("polls.api.polls.urls")),
     path("auth/", include("polls.api.auth.urls")),
     path("user_stats/", views.get_user_stats, name="me"),
+    path("metrics/", views.get_metrics, name="metrics"),
 ]
@@ -1 +1,2 @@
 from .user_stats import get_user_stats
+from .metrics import get_metrics
@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from polls.metrics import request_metrics
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@renderer_classes([JSONRenderer])
+def get_metrics(request):
+    # Keyed by URL name, so rendered without the camelCase key conversion.
+    return Response(request_metrics.snapshot(), status.HTTP_200_OK)
@@ -1,25 +1,22 @@
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
-from polls.models import Vote, Poll
+from polls.api.decorators import async_api_view
+from polls.stats import aget_user_stats
+from polls.routers import read_from_replica
 
 
-@api_view(["GET"])
-def get_user_stats(request):
+@async_api_view(["GET"])
+@read_from_replica
+async def get_user_stats(request):
     user = request.user
     date_joined = user.date_joined.isoformat()
-    user_polls = Poll.objects.filter(user=user)
-
-    total_polls = user_polls.count()
-    active_polls = len([None for p in user_polls if p.is_active])
-    expired_polls = total_polls - active_polls
-    total_votes = Vote.objects.filter(user=user).count()
+    stats = await aget_user_stats(user.id)
 
     user_stats = {
-        "total_polls": total_polls,
-        "active_polls": active_polls,
-        "expired_polls": expired_polls,
-        "total_votes": total_votes,
+        "total_polls": stats["total_polls"],
+        "active_polls": stats["active_polls"],
+        "expired_polls": stats["total_polls"] - stats["active_polls"],
+        "total_votes": stats["total_votes"],
         "date_joined": date_joined,
     }
 
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class PollsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "polls"
+
+    def ready(self):
+        from . import (  # noqa: F401
+            authentication,
+            cache,
+            histograms,
+            middleware,
+            realtime,
+            routers,
+            search,
+            stats,
+            trending,
+            votelog,
+        )
@@ -0,0 +1,156 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .cache import get_poll_cache
+
+
+def _user_key(user_id):
+    return f"auth_user_fields:{user_id}"
+
+
+# Every field of a user but the password hash, which stays out of the shared
+# cache and is only loaded if accessed.
+CACHED_USER_FIELDS = [
+    field.attname for field in User._meta.concrete_fields if field.name != "password"
+]
+
+
+def _cached_user(values):
+    return User.from_db(None, CACHED_USER_FIELDS, values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that keeps the ``CACHED_USER_FIELDS`` of the users it
+    looked up in the polls cache for ``POLLS_AUTH_USER_CACHE_TIMEOUT``
+    seconds, so that authenticated requests normally make no query at all.
+    Saving a user drops their entry.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        values = get_poll_cache().get(_user_key(user_id)) if user_id else None
+        if values is not None:
+            return _cached_user(values)
+
+        user = super().get_user(validated_token)
+        get_poll_cache().set(
+            _user_key(user_id),
+            [getattr(user, name) for name in CACHED_USER_FIELDS],
+            settings.POLLS_AUTH_USER_CACHE_TIMEOUT,
+        )
+        return user
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views, only leaving the loop on a miss."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        values = await get_poll_cache().aget(_user_key(user_id)) if user_id else None
+        if values is not None:
+            return _cached_user(values)
+        return await sync_to_async(self.get_user)(validated_token)
+
+
+@receiver(post_save, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    get_poll_cache().delete(_user_key(instance.pk))
+
+
+class BlacklistedTokens:
+    """
+    In-process copy of the blacklisted JTIs, topped up with only the rows
+    added since the last refresh (at most every ``refresh_interval`` seconds)
+    and pruned of tokens that have expired anyway.
+    """
+
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._expiries = {}
+        self._last_id = 0
+        self._refreshed_at = None
+
+    def __contains__(self, jti):
+        self.refresh()
+        return jti in self._expiries
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._expiries[jti] = expires_at
+
+    def refresh(self):
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._refreshed_at is not None
+                and now - self._refreshed_at < self.refresh_interval
+            ):
+                return
+            self._refreshed_at = now
+
+            new_rows = BlacklistedToken.objects.filter(
+                id__gt=self._last_id, token__expires_at__gt=timezone.now()
+            ).values_list("id", "token__jti", "token__expires_at")
+            for row_id, jti, expires_at in new_rows:
+                self._expiries[jti] = expires_at
+                self._last_id = max(self._last_id, row_id)
+
+            current_time = timezone.now()
+            self._expiries = {
+                jti: expires_at
+                for jti, expires_at in self._expiries.items()
+                if expires_at > current_time
+            }
+
+
+blacklisted_tokens = BlacklistedTokens(settings.POLLS_JWT_BLACKLIST_REFRESH_INTERVAL)
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token checked against ``blacklisted_tokens`` instead of querying
+    the blacklist on every use. A token blacklisted by another process in the
+    last refresh interval is still caught when it gets blacklisted again on
+    rotation or logout, which then fails.
+    """
+
+    def check_blacklist(self):
+        if self.payload[api_settings.JTI_CLAIM] in blacklisted_tokens:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted, created = super().blacklist()
+        if not created:
+            raise TokenError(_("Token is blacklisted"))
+
+        blacklisted_tokens.add(
+            self.payload[api_settings.JTI_CLAIM],
+            datetime_from_epoch(self.payload["exp"]),
+        )
+        return blacklisted, created
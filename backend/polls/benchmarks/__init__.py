@@ -0,0 +1,99 @@
+"""
+Helpers shared by the ``bench_*`` management commands.
+
+Benchmarks run against a throwaway copy of the configured database (the same
+one the test runner would create), so they never touch real data.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from polls.models import Choice, Poll
+
+
+@contextmanager
+def benchmark_database(name=None):
+    """
+    Run against a freshly migrated test database, named ``name`` instead of
+    the test runner's default (an in-memory database on SQLite) if given.
+    Throttling is off: a benchmark is one very busy client.
+    """
+    unthrottled = override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+    )
+    unthrottled.enable()
+    setup_test_environment()
+    if name is not None:
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = name
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        unthrottled.disable()
+
+
+def seed_polls(count, choices_per_poll=4, user=None):
+    """Create ``count`` active polls with ``choices_per_poll`` choices each."""
+    if user is None:
+        user = User.objects.create_user(f"bench-{Poll.objects.count()}")
+    now = timezone.now()
+    polls = Poll.objects.bulk_create(
+        Poll(
+            question=f"Benchmark poll #{i}?",
+            description="Seeded by a benchmark.",
+            user=user,
+            created_at=now - timedelta(seconds=i),
+            deadline=now + timedelta(days=7),
+        )
+        for i in range(count)
+    )
+    Choice.objects.bulk_create(
+        Choice(poll=poll, choice_txt=f"Choice {j}", vote_count=j)
+        for poll in polls
+        for j in range(choices_per_poll)
+    )
+    return polls
+
+
+def best_of(repeat, func):
+    """Run ``func`` ``repeat`` times; return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def summarize(timings):
+    """Latency percentiles, in milliseconds, of timings given in seconds."""
+    if not timings:
+        return {"count": 0}
+    timings = sorted(timings)
+    if len(timings) == 1:
+        # quantiles() needs two points; every percentile of one is itself.
+        cuts = timings * 99
+    else:
+        cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "count": len(timings),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p90_ms": round(cuts[89] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(timings[-1] * 1000, 3),
+    }
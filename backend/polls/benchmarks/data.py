@@ -0,0 +1,111 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from polls.counters import recorded_poll_totals
+from polls.expiry import finalize_due_polls
+from polls.models import Choice, Poll, Vote
+from polls.search import index_polls
+
+BATCH_SIZE = 5000
+
+
+def seed_dataset(users, polls, choices_per_poll=4, votes_per_poll=10, seed=0):
+    """
+    Seed ``users`` users owning ``polls`` polls between them, a fifth of them
+    expired and a third allowing multiple choices, each receiving up to
+    ``votes_per_poll`` ballots from distinct users. ``Choice.vote_count`` and
+    the poll totals are kept consistent with the generated votes, polls are
+    indexed for search and expired polls are finalized. Deterministic for a
+    given ``seed``.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    first_user = User.objects.count()
+    User.objects.bulk_create(
+        (User(username=f"voter-{first_user + i}") for i in range(users)),
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = list(User.objects.order_by("-id").values_list("id", flat=True)[:users])
+
+    created = [
+        now - timedelta(minutes=rng.randrange(1, 60 * 24 * 30)) for _ in range(polls)
+    ]
+    new_polls = Poll.objects.bulk_create(
+        (
+            Poll(
+                question=f"Seeded poll #{i}?",
+                description="Generated benchmark data.",
+                allows_multiple_choices=i % 3 == 0,
+                user_id=rng.choice(user_ids),
+                created_at=created[i],
+                deadline=(
+                    created[i] + timedelta(minutes=1)
+                    if i % 5 == 0
+                    else now + timedelta(days=rng.randrange(1, 30))
+                ),
+            )
+            for i in range(polls)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    new_choices = Choice.objects.bulk_create(
+        (
+            Choice(poll=poll, choice_txt=f"Option {j}")
+            for poll in new_polls
+            for j in range(choices_per_poll)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    def ballots():
+        for index, poll in enumerate(new_polls):
+            options = new_choices[
+                index * choices_per_poll : (index + 1) * choices_per_poll
+            ]
+            voters = rng.sample(user_ids, min(votes_per_poll, len(user_ids)))
+            for voter in voters:
+                picks = (
+                    rng.sample(options, rng.randint(1, len(options)))
+                    if poll.allows_multiple_choices
+                    else [rng.choice(options)]
+                )
+                for choice in picks:
+                    yield Vote(
+                        user_id=voter,
+                        poll=poll,
+                        choice=choice,
+                        single_choice=not poll.allows_multiple_choices,
+                    )
+
+    Vote.objects.bulk_create(ballots(), batch_size=BATCH_SIZE)
+    Choice.objects.filter(poll__in=new_polls).update(
+        vote_count=Coalesce(
+            Subquery(
+                Vote.objects.filter(choice=OuterRef("pk"))
+                .values("choice")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+    )
+
+    seeded = Poll.objects.filter(id__in=[poll.id for poll in new_polls])
+    seeded.update(**recorded_poll_totals())
+    index_polls(seeded)
+
+    finalize_due_polls(cutoff=now)
+
+    return {
+        "users": users,
+        "polls": polls,
+        "choices_per_poll": choices_per_poll,
+        "votes_per_poll": votes_per_poll,
+        "votes": Vote.objects.filter(poll__in=new_polls).count(),
+    }
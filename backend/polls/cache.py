@@ -0,0 +1,81 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .signals import votes_cast
+
+
+def get_poll_cache():
+    return caches[settings.POLLS_CACHE]
+
+
+def is_poll_cache_shared():
+    """Whether other processes see the polls cache, unlike a LocMemCache."""
+    return not isinstance(get_poll_cache(), LocMemCache)
+
+
+def _poll_key(poll_id):
+    return f"poll:{poll_id}"
+
+
+def get_cached_poll(poll_id):
+    """Return the ``(etag, data)`` cached for a poll, or ``None``."""
+    return get_poll_cache().get(_poll_key(poll_id))
+
+
+async def aget_cached_poll(poll_id):
+    return await get_poll_cache().aget(_poll_key(poll_id))
+
+
+def _poll_entry(poll, data):
+    etag = (
+        '"%s"'
+        % hashlib.md5(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    )
+
+    if poll.status == poll.Status.EXPIRED:
+        timeout = None
+    else:
+        # Counts of a poll past its deadline still change until it is
+        # finalized, so it keeps the active timeout until then.
+        remaining = (poll.deadline - timezone.now()).total_seconds()
+        timeout = settings.POLLS_CACHE_ACTIVE_TIMEOUT
+        if remaining > 0:
+            timeout = min(timeout, remaining)
+
+    return etag, (etag, dict(data)), timeout
+
+
+def cache_poll(poll, data):
+    """
+    Cache the serialized representation of ``poll`` and return its ETag.
+
+    Results of a finalized poll can no longer change, so they are kept until
+    evicted; other polls expire at the latest when voting closes, so that
+    ``is_active`` is never served stale.
+    """
+    etag, entry, timeout = _poll_entry(poll, data)
+    get_poll_cache().set(_poll_key(poll.id), entry, timeout)
+    return etag
+
+
+async def acache_poll(poll, data):
+    etag, entry, timeout = _poll_entry(poll, data)
+    await get_poll_cache().aset(_poll_key(poll.id), entry, timeout)
+    return etag
+
+
+def invalidate_poll(poll_id):
+    get_poll_cache().delete(_poll_key(poll_id))
+
+
+@receiver(votes_cast)
+def invalidate_voted_poll(sender, poll_id, **kwargs):
+    invalidate_poll(poll_id)
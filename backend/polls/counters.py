@@ -0,0 +1,216 @@
+import atexit
+import random
+import threading
+from collections import Counter, defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils.module_loading import import_string
+
+from .models import Choice, ChoiceCounterShard, Poll, Vote
+from .periodic import PeriodicTask
+
+
+class DirectVoteCounter:
+    """
+    Increments ``Choice.vote_count`` and the poll's ``total_votes`` and
+    ``unique_voters`` in place. Simple and always exact, but every vote on a
+    poll contends for the same rows.
+    """
+
+    def increment(self, poll_id, choice_ids, new_voter):
+        """
+        Count a ballot for ``choice_ids`` of ``poll_id``, from a user who had
+        not voted on it before if ``new_voter``.
+        """
+        Choice.objects.filter(id__in=choice_ids).update(vote_count=F("vote_count") + 1)
+        # Last, so that the poll row stays locked only until the commit.
+        Poll.objects.filter(id=poll_id).update(
+            total_votes=F("total_votes") + len(choice_ids),
+            unique_voters=F("unique_voters") + int(new_voter),
+        )
+
+    def choices(self):
+        """
+        Queryset that choices must be read through to see current counts,
+        annotated with the increments not yet folded into ``vote_count``.
+        """
+        return Choice.objects.annotate(pending_vote_count=Value(0))
+
+    def flush(self):
+        """
+        Fold pending increments into ``Choice.vote_count`` and the poll
+        totals.
+        """
+
+
+class ShardedVoteCounter(DirectVoteCounter):
+    """
+    Spreads increments over ``shards`` rows per choice, picked at random, so
+    concurrent voters rarely wait on the same row lock. Reads add the shard
+    totals to ``vote_count``; ``flush`` folds them back in, and into the poll
+    totals, which lag until then.
+    """
+
+    def __init__(self, shards=8):
+        self.shards = shards
+
+    def increment(self, poll_id, choice_ids, new_voter):
+        shard = random.randrange(self.shards)
+        # Make sure every shard row exists, tolerating concurrent voters doing
+        # the same, then count the vote in all of them at once.
+        ChoiceCounterShard.objects.bulk_create(
+            [
+                ChoiceCounterShard(choice_id=choice_id, shard=shard)
+                for choice_id in choice_ids
+            ],
+            ignore_conflicts=True,
+        )
+        ChoiceCounterShard.objects.filter(choice_id__in=choice_ids, shard=shard).update(
+            count=F("count") + 1,
+            voters=F("voters")
+            + Case(When(choice_id=choice_ids[0], then=int(new_voter)), default=0),
+        )
+
+    def choices(self):
+        return Choice.objects.annotate(
+            pending_vote_count=Coalesce(Sum("counter_shards__count"), 0)
+        )
+
+    def flush(self):
+        with transaction.atomic():
+            shard_ids = list(
+                ChoiceCounterShard.objects.select_for_update()
+                .filter(count__gt=0)
+                .values_list("id", flat=True)
+            )
+            shards = ChoiceCounterShard.objects.filter(id__in=shard_ids)
+            pending = (
+                shards.filter(choice=OuterRef("pk"))
+                .values("choice")
+                .annotate(total=Sum("count"))
+                .values("total")
+            )
+            Choice.objects.filter(
+                id__in=shards.values_list("choice_id", flat=True)
+            ).update(vote_count=F("vote_count") + Subquery(pending))
+
+            poll_shards = (
+                shards.filter(choice__poll=OuterRef("pk"))
+                .values("choice__poll")
+                .annotate(votes=Sum("count"), voters=Sum("voters"))
+            )
+            Poll.objects.filter(
+                id__in=shards.values_list("choice__poll_id", flat=True)
+            ).update(
+                total_votes=F("total_votes") + Subquery(poll_shards.values("votes")),
+                unique_voters=F("unique_voters")
+                + Subquery(poll_shards.values("voters")),
+            )
+            shards.update(count=0, voters=0)
+
+
+class BufferedVoteCounter(DirectVoteCounter):
+    """
+    Accumulates committed increments in process memory and writes them out
+    every ``flush_interval`` seconds from a background thread, one UPDATE per
+    distinct increment. Reads see the materialized ``vote_count`` and poll
+    totals, which lag by up to the flush interval; increments not yet flushed are lost if the
+    process is killed.
+    """
+
+    def __init__(self, flush_interval=1.0):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        # poll id: Counter({"votes": ..., "voters": ...})
+        self._pending_polls = defaultdict(Counter)
+        self._flusher = PeriodicTask(self.flush, flush_interval)
+        atexit.register(self.flush)
+
+    def increment(self, poll_id, choice_ids, new_voter):
+        self._flusher.start()
+        transaction.on_commit(lambda: self._add(poll_id, choice_ids, new_voter))
+
+    def _add(self, poll_id, choice_ids, new_voter):
+        with self._lock:
+            self._pending.update(choice_ids)
+            self._pending_polls[poll_id].update(
+                votes=len(choice_ids), voters=int(new_voter)
+            )
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            pending_polls, self._pending_polls = self._pending_polls, defaultdict(
+                Counter
+            )
+
+        by_increment = defaultdict(list)
+        for choice_id, increment in pending.items():
+            by_increment[increment].append(choice_id)
+        polls_by_increment = defaultdict(list)
+        for poll_id, totals in pending_polls.items():
+            polls_by_increment[totals["votes"], totals["voters"]].append(poll_id)
+        try:
+            for increment, choice_ids in by_increment.items():
+                Choice.objects.filter(id__in=choice_ids).update(
+                    vote_count=F("vote_count") + increment
+                )
+                for choice_id in choice_ids:
+                    del pending[choice_id]
+            for (votes, voters), poll_ids in polls_by_increment.items():
+                Poll.objects.filter(id__in=poll_ids).update(
+                    total_votes=F("total_votes") + votes,
+                    unique_voters=F("unique_voters") + voters,
+                )
+                for poll_id in poll_ids:
+                    del pending_polls[poll_id]
+        except Exception:
+            # Kept for the next flush.
+            with self._lock:
+                self._pending.update(pending)
+                for poll_id, totals in pending_polls.items():
+                    self._pending_polls[poll_id].update(totals)
+            raise
+
+
+@cache
+def get_vote_counter():
+    counter_class = import_string(settings.POLLS_VOTE_COUNTER)
+    return counter_class(**settings.POLLS_VOTE_COUNTER_OPTIONS)
+
+
+def prefetch_choices():
+    return Prefetch("choice_set", queryset=get_vote_counter().choices())
+
+
+def recorded_poll_totals():
+    """
+    ``Poll.total_votes`` and ``Poll.unique_voters`` counted from the recorded
+    ``Vote`` rows, as expressions to annotate or update polls with.
+    """
+    votes = Vote.objects.filter(poll=OuterRef("pk")).values("poll")
+    return {
+        "total_votes": Coalesce(
+            Subquery(votes.annotate(total=Count("id")).values("total")), 0
+        ),
+        "unique_voters": Coalesce(
+            Subquery(
+                votes.annotate(total=Count("user", distinct=True)).values("total")
+            ),
+            0,
+        ),
+    }
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .api.polls.serializers import PollSerializer
+from .cache import cache_poll, is_poll_cache_shared
+from .counters import get_vote_counter, prefetch_choices
+from .models import Poll
+
+
+def finalize_due_polls(cutoff=None):
+    """
+    Finalize the active polls whose deadline passed before ``cutoff``
+    (``POLLS_FINALIZE_GRACE_SECONDS`` ago by default): freeze their vote
+    counts into ``results``, mark them expired, drop their trending score and
+    cache their final representation, if the polls cache is shared with the
+    web processes. Return how many polls were finalized.
+
+    The grace period lets votes validated just before the deadline commit
+    before the counts are frozen.
+    """
+    if cutoff is None:
+        cutoff = timezone.now() - timedelta(
+            seconds=settings.POLLS_FINALIZE_GRACE_SECONDS
+        )
+    finalized = 0
+    while True:
+        with transaction.atomic():
+            polls = list(
+                Poll.objects.select_for_update(skip_locked=True)
+                .filter(status=Poll.Status.ACTIVE, deadline__lte=cutoff)
+                .order_by("deadline")[: settings.POLLS_FINALIZE_BATCH_SIZE]
+            )
+            if not polls:
+                return finalized
+
+            results = {poll.id: {} for poll in polls}
+            for choice_id, poll_id, vote_count, pending in (
+                get_vote_counter()
+                .choices()
+                .filter(poll__in=polls)
+                .values_list("id", "poll_id", "vote_count", "pending_vote_count")
+            ):
+                results[poll_id][str(choice_id)] = vote_count + pending
+            for poll in polls:
+                poll.status = Poll.Status.EXPIRED
+                poll.results = results[poll.id]
+                poll.trending_score = None
+            Poll.objects.bulk_update(polls, ["status", "results", "trending_score"])
+
+            poll_ids = [poll.id for poll in polls]
+            if is_poll_cache_shared():
+                transaction.on_commit(partial(warm_poll_cache, poll_ids))
+        finalized += len(polls)
+
+
+def warm_poll_cache(poll_ids):
+    """Cache the final representation of finalized polls, until evicted."""
+    polls = Poll.objects.select_related("user").prefetch_related(prefetch_choices())
+    for poll in polls.filter(id__in=poll_ids):
+        cache_poll(poll, PollSerializer(poll).data)
+
+
+def next_deadline():
+    """The earliest deadline among polls still to finalize, or ``None``."""
+    return Poll.objects.filter(status=Poll.Status.ACTIVE).aggregate(
+        next=Min("deadline")
+    )["next"]
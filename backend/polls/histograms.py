@@ -0,0 +1,142 @@
+"""
+Vote histograms: how many votes each choice of a poll received per minute,
+hour or day, read in time proportional to the number of buckets whatever the
+number of votes.
+
+Ballots are counted into minute buckets as they are cast. The
+``compact_vote_histograms`` command folds minute buckets older than
+``POLLS_HISTOGRAM_MINUTE_RETENTION`` seconds into hour buckets, and hour
+buckets older than ``POLLS_HISTOGRAM_HOUR_RETENTION`` into day buckets. A
+histogram adds up the buckets of its resolution and those of finer ones not
+compacted yet, so it is exact whether or not compaction ran; a finer
+resolution only reaches back as far as its buckets are kept. Buckets are
+aligned on UTC.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import VoteBucket
+from .signals import votes_cast
+
+MINUTE = VoteBucket.Resolution.MINUTE
+HOUR = VoteBucket.Resolution.HOUR
+DAY = VoteBucket.Resolution.DAY
+
+# Finest first.
+RESOLUTIONS = {MINUTE: 60, HOUR: 3600, DAY: 86400}
+
+COMPACT_BATCH_SIZE = 2000
+
+
+def bucket_start(at, resolution):
+    """The start of the ``resolution`` bucket holding ``at``."""
+    step = RESOLUTIONS[resolution]
+    return datetime.fromtimestamp(at.timestamp() // step * step, dt_timezone.utc)
+
+
+def vote_histogram(poll_id, resolution):
+    """
+    ``(start, {choice_id: votes})`` for each ``resolution`` bucket in which
+    the poll received votes, oldest first.
+    """
+    finer = list(RESOLUTIONS)[: list(RESOLUTIONS).index(resolution) + 1]
+    counts = defaultdict(Counter)
+    for choice_id, start, count in VoteBucket.objects.filter(
+        poll_id=poll_id, resolution__in=finer
+    ).values_list("choice_id", "start", "count"):
+        counts[bucket_start(start, resolution)][choice_id] += count
+    return [(start, dict(counts[start])) for start in sorted(counts)]
+
+
+def compact_vote_buckets(now=None):
+    """
+    Fold the minute and hour buckets past their retention into buckets of
+    the next resolution. Return how many buckets were folded.
+    """
+    if now is None:
+        now = timezone.now()
+    folded = 0
+    for finer, coarser, retention in (
+        (MINUTE, HOUR, settings.POLLS_HISTOGRAM_MINUTE_RETENTION),
+        (HOUR, DAY, settings.POLLS_HISTOGRAM_HOUR_RETENTION),
+    ):
+        # Only whole coarser buckets, so that none is left split between two
+        # resolutions for longer than needed.
+        cutoff = bucket_start(now - timedelta(seconds=retention), coarser)
+        while batch := _fold(finer, coarser, cutoff):
+            folded += batch
+    return folded
+
+
+def _fold(finer, coarser, cutoff):
+    with transaction.atomic():
+        buckets = list(
+            VoteBucket.objects.select_for_update(skip_locked=True).filter(
+                resolution=finer, start__lt=cutoff
+            )[:COMPACT_BATCH_SIZE]
+        )
+        if not buckets:
+            return 0
+
+        totals = Counter()
+        poll_ids = {}
+        for bucket in buckets:
+            totals[
+                bucket.choice_id, bucket_start(bucket.start, coarser)
+            ] += bucket.count
+            poll_ids[bucket.choice_id] = bucket.poll_id
+
+        existing = {
+            (bucket.choice_id, bucket.start): bucket
+            for bucket in VoteBucket.objects.select_for_update().filter(
+                resolution=coarser,
+                choice_id__in={choice_id for choice_id, _ in totals},
+                start__in={start for _, start in totals},
+            )
+        }
+        updated, created = [], []
+        for (choice_id, start), count in totals.items():
+            bucket = existing.get((choice_id, start))
+            if bucket is None:
+                created.append(
+                    VoteBucket(
+                        poll_id=poll_ids[choice_id],
+                        choice_id=choice_id,
+                        resolution=coarser,
+                        start=start,
+                        count=count,
+                    )
+                )
+            else:
+                bucket.count += count
+                updated.append(bucket)
+        VoteBucket.objects.bulk_update(updated, ["count"])
+        VoteBucket.objects.bulk_create(created)
+        VoteBucket.objects.filter(id__in=[bucket.id for bucket in buckets]).delete()
+    return len(buckets)
+
+
+@receiver(votes_cast)
+def count_ballot(sender, poll_id, choice_ids, **kwargs):
+    start = bucket_start(timezone.now(), MINUTE)
+    # Make sure every bucket exists, tolerating concurrent voters doing the
+    # same, then count the ballot in all of them at once.
+    VoteBucket.objects.bulk_create(
+        [
+            VoteBucket(
+                poll_id=poll_id, choice_id=choice_id, resolution=MINUTE, start=start
+            )
+            for choice_id in choice_ids
+        ],
+        ignore_conflicts=True,
+    )
+    VoteBucket.objects.filter(
+        choice_id__in=choice_ids, resolution=MINUTE, start=start
+    ).update(count=F("count") + 1)
@@ -0,0 +1,142 @@
+"""
+``Idempotency-Key`` support for write views: a client that retries a request
+with the key of the original gets the original response back, at the cost of
+a cache lookup, instead of the request running again.
+
+Responses are kept for ``POLLS_IDEMPOTENCY_TTL`` seconds in the
+``POLLS_IDEMPOTENCY_CACHE`` alias, whose size bounds how many keys are
+remembered. Keys are scoped to the requesting user. Reusing a key for a
+different request is refused, as is retrying while the original request is
+still running. Server errors are not kept, so that they can be retried.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+MAX_KEY_LENGTH = 255
+
+# How long (in seconds) a key stays claimed by a request still running,
+# should its process die before storing the response.
+PENDING_TIMEOUT = 60
+
+_PENDING = "pending"
+_DONE = "done"
+
+
+def get_idempotency_cache():
+    return caches[settings.POLLS_IDEMPOTENCY_CACHE]
+
+
+def _request_key(request):
+    """``(cache_key, fingerprint)`` of the request, or ``None`` without a key."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return None
+    if not 0 < len(key) <= MAX_KEY_LENGTH:
+        raise ValidationError(
+            {IDEMPOTENCY_HEADER: [f"Expected 1 to {MAX_KEY_LENGTH} characters."]}
+        )
+
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    # request.data, as throttles may already have consumed the body.
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    fingerprint = hashlib.sha256(
+        f"{request.method} {request.path}\n{body}".encode()
+    ).hexdigest()
+    return f"idempotency:{request.user.pk}:{digest}", fingerprint
+
+
+def _replay(entry, fingerprint):
+    """The response to a request whose key is already taken by ``entry``."""
+    if entry is None or entry[0] == _PENDING:
+        return Response(
+            {"detail": "A request with this Idempotency-Key is still in progress."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    _, stored_fingerprint, status_code, data = entry
+    if stored_fingerprint != fingerprint:
+        return Response(
+            {"detail": "This Idempotency-Key was used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(data, status=status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def _entry(fingerprint, response):
+    """What to keep of a response, or ``None`` to let the request be retried."""
+    if response.status_code >= 500 or response.status_code in (
+        status.HTTP_409_CONFLICT,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ):
+        return None
+    return _DONE, fingerprint, response.status_code, response.data
+
+
+def idempotent(view):
+    """
+    Serve retries of a write view carrying an ``Idempotency-Key`` header from
+    the response to their first attempt.
+    """
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            request_key = _request_key(request)
+            if request_key is None:
+                return await view(request, *args, **kwargs)
+
+            cache_key, fingerprint = request_key
+            cache = get_idempotency_cache()
+            if not await cache.aadd(
+                cache_key, (_PENDING, fingerprint), PENDING_TIMEOUT
+            ):
+                return _replay(await cache.aget(cache_key), fingerprint)
+
+            try:
+                response = await view(request, *args, **kwargs)
+            except BaseException:
+                await cache.adelete(cache_key)
+                raise
+            entry = _entry(fingerprint, response)
+            if entry is None:
+                await cache.adelete(cache_key)
+            else:
+                await cache.aset(cache_key, entry, settings.POLLS_IDEMPOTENCY_TTL)
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request_key = _request_key(request)
+        if request_key is None:
+            return view(request, *args, **kwargs)
+
+        cache_key, fingerprint = request_key
+        cache = get_idempotency_cache()
+        if not cache.add(cache_key, (_PENDING, fingerprint), PENDING_TIMEOUT):
+            return _replay(cache.get(cache_key), fingerprint)
+
+        try:
+            response = view(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+        entry = _entry(fingerprint, response)
+        if entry is None:
+            cache.delete(cache_key)
+        else:
+            cache.set(cache_key, entry, settings.POLLS_IDEMPOTENCY_TTL)
+        return response
+
+    return wrapper
@@ -0,0 +1,248 @@
+import json
+import platform
+import random
+import threading
+import time
+from datetime import timedelta
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from polls.benchmarks import benchmark_database, summarize
+from polls.benchmarks.data import seed_dataset
+from polls.counters import get_vote_counter
+from polls.models import Choice, Poll, Vote
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database, then measure latency percentiles and query "
+        "counts of every polls endpoint plus a concurrent vote storm. Results "
+        "are printed (or written) as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--polls", type=int, default=5000)
+        parser.add_argument("--choices", type=int, default=4)
+        parser.add_argument("--votes-per-poll", type=int, default=10)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per endpoint."
+        )
+        parser.add_argument("--storm-voters", type=int, default=500)
+        parser.add_argument("--storm-threads", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--database",
+            help="Benchmark database name (e.g. a file path on SQLite) instead "
+            "of the test runner's default. The vote storm needs a file on "
+            "SQLite: threads sharing an in-memory database fail with table "
+            "locks instead of waiting for each other.",
+        )
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+
+        with benchmark_database(options["database"]):
+            if (
+                options["storm_voters"]
+                and connection.vendor == "sqlite"
+                and connection.is_in_memory_db()
+            ):
+                raise CommandError(
+                    "The vote storm needs a file database on SQLite: pass "
+                    "--database (e.g. --database bench.sqlite3) or "
+                    "--storm-voters 0."
+                )
+            dataset = seed_dataset(
+                options["users"],
+                options["polls"],
+                options["choices"],
+                options["votes_per_poll"],
+                seed=options["seed"],
+            )
+            results = {
+                "meta": {
+                    "timestamp": timezone.now().isoformat(),
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "database": connection.vendor,
+                    "dataset": dataset,
+                },
+                "endpoints": self.bench_endpoints(options["requests"]),
+                "vote_storm": self.bench_vote_storm(
+                    options["storm_voters"], options["storm_threads"]
+                ),
+            }
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        # Timings of failed requests are not worth reporting as a result.
+        failures = [
+            f"{name}: {statuses}"
+            for name, result in results["endpoints"].items()
+            if (statuses := {code for code in result["statuses"] if code >= 400})
+        ]
+        if results["vote_storm"]["errors"]:
+            failures.append(f"vote storm: {results['vote_storm']['errors']}")
+        if failures:
+            raise CommandError("Requests failed; " + "; ".join(failures))
+
+    def measure(self, count, make_request):
+        """Time ``count`` calls of ``make_request(i)`` and count their queries."""
+        timings, queries, statuses = [], [], {}
+        for i in range(count):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = make_request(i)
+                timings.append(time.perf_counter() - start)
+            queries.append(len(captured))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        return {
+            "latency": summarize(timings),
+            "queries": {"mean": sum(queries) / len(queries), "max": max(queries)},
+            "statuses": statuses,
+        }
+
+    def bench_endpoints(self, count):
+        poll_ids = list(Poll.objects.values_list("id", flat=True))
+        users = list(User.objects.all()[:count])
+        client = APIClient()
+
+        def as_user(i):
+            client.force_authenticate(users[i % len(users)])
+            return client
+
+        def create(i):
+            return as_user(i).post(
+                "/polls/api/polls/create/",
+                {
+                    "question": f"Benchmark poll {i}?",
+                    "deadline": (timezone.now() + timedelta(days=1)).isoformat(),
+                    "choiceSet": [{"choiceTxt": f"Option {j}"} for j in range(4)],
+                },
+                format="json",
+            )
+
+        new_polls = []
+
+        def create_and_keep(i):
+            response = create(i)
+            new_polls.append(response.json())
+            return response
+
+        def vote(i):
+            # A fresh poll each time, so that no ballot is a duplicate.
+            poll = new_polls[i]
+            choice = self.rng.choice(poll["choiceSet"])
+            return as_user(i).post(
+                "/polls/api/polls/vote/",
+                [{"poll": poll["id"], "choice": choice["id"]}],
+                format="json",
+            )
+
+        results = {
+            "get_polls": self.measure(
+                count, lambda i: as_user(i).get("/polls/api/polls/")
+            ),
+            "get_poll": self.measure(
+                count,
+                lambda i: as_user(i).get(
+                    f"/polls/api/polls/{self.rng.choice(poll_ids)}/"
+                ),
+            ),
+        }
+        results["create"] = self.measure(count, create_and_keep)
+        results["vote"] = self.measure(count, vote)
+        results["get_user_stats"] = self.measure(
+            count, lambda i: as_user(i).get("/polls/api/user_stats/")
+        )
+        return results
+
+    def bench_vote_storm(self, voters, threads):
+        """
+        Have ``voters`` new users vote on one hot poll from ``threads``
+        concurrent threads, then check the counters against the vote rows.
+        """
+        owner = User.objects.create_user("storm-owner")
+        poll = Poll.objects.create(
+            question="Storm poll?",
+            user=owner,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        choice_ids = [
+            choice.id
+            for choice in Choice.objects.bulk_create(
+                Choice(poll=poll, choice_txt=f"Option {j}") for j in range(4)
+            )
+        ]
+        storm_users = User.objects.bulk_create(
+            User(username=f"storm-voter-{i}") for i in range(voters)
+        )
+
+        lock = threading.Lock()
+        timings, errors = [], {}
+
+        def worker(index):
+            client = APIClient()
+            local_timings, local_errors = [], {}
+            try:
+                for user in storm_users[index::threads]:
+                    client.force_authenticate(user)
+                    start = time.perf_counter()
+                    try:
+                        response = client.post(
+                            "/polls/api/polls/vote/",
+                            [{"poll": poll.id, "choice": random.choice(choice_ids)}],
+                            format="json",
+                        )
+                        status = response.status_code
+                    except Exception as error:
+                        status = type(error).__name__
+                    local_timings.append(time.perf_counter() - start)
+                    if status != 201:
+                        local_errors[status] = local_errors.get(status, 0) + 1
+            finally:
+                connections.close_all()
+            with lock:
+                timings.extend(local_timings)
+                for status, total in local_errors.items():
+                    errors[status] = errors.get(status, 0) + total
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        get_vote_counter().flush()
+        recorded = Vote.objects.filter(poll=poll).count()
+        counted = sum(
+            Choice.objects.filter(poll=poll).values_list("vote_count", flat=True)
+        )
+        return {
+            "voters": voters,
+            "threads": threads,
+            "elapsed_s": round(elapsed, 3),
+            "votes_per_sec": round(recorded / elapsed, 1),
+            "latency": summarize(timings),
+            "errors": {str(status): total for status, total in errors.items()},
+            "error_rate": round(sum(errors.values()) / voters, 4) if voters else 0,
+            "recorded_votes": recorded,
+            "counted_votes": counted,
+            "consistent": recorded == counted,
+        }
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from polls.benchmarks import benchmark_database, summarize
+from polls.benchmarks.data import seed_dataset
+from polls.models import Poll
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec of the read endpoints served through the ASGI "
+        "handler (one event loop) and the WSGI handler (a pool of worker "
+        "threads), with clients that take --client-delay ms to receive each "
+        "response. Both handlers are driven in process, without a server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--polls", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=500,
+            help="Concurrent clients kept open against the ASGI handler.",
+        )
+        parser.add_argument(
+            "--wsgi-workers",
+            type=int,
+            default=16,
+            help="Worker threads serving WSGI, each busy for a whole request.",
+        )
+        parser.add_argument("--client-delay", type=float, default=500.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--database")
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        delay = options["client_delay"] / 1000
+
+        with benchmark_database(options["database"]):
+            dataset = seed_dataset(
+                options["users"], options["polls"], seed=options["seed"]
+            )
+            requests = self.make_requests(options["requests"], rng)
+            results = {
+                "meta": {
+                    "database": connection.vendor,
+                    "dataset": dataset,
+                    "requests": len(requests),
+                    "client_delay_ms": options["client_delay"],
+                },
+                "asgi": self.bench_asgi(requests, options["clients"], delay),
+                "wsgi": self.bench_wsgi(requests, options["wsgi_workers"], delay),
+            }
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def make_requests(self, count, rng):
+        """``(path, authorization header)`` pairs cycling over the endpoints."""
+        poll_ids = list(Poll.objects.values_list("id", flat=True))
+        tokens = [
+            f"Bearer {AccessToken.for_user(user)}"
+            for user in User.objects.order_by("id")
+        ]
+        paths = [
+            lambda: "/polls/api/polls/",
+            lambda: f"/polls/api/polls/{rng.choice(poll_ids)}/",
+            lambda: "/polls/api/user_stats/",
+        ]
+        return [(paths[i % len(paths)](), rng.choice(tokens)) for i in range(count)]
+
+    def report(self, elapsed, timings, statuses):
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests_per_sec": round(len(timings) / elapsed, 1),
+            "latency": summarize(timings),
+            "statuses": {str(status): total for status, total in statuses.items()},
+        }
+
+    def bench_asgi(self, requests, clients, delay):
+        application = get_asgi_application()
+
+        async def request(path, authorization):
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"authorization", authorization.encode()),
+                ],
+                "client": ("127.0.0.1", 0),
+                "server": ("testserver", 80),
+            }
+            status = None
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # The client stays connected until the response is sent.
+                return await asyncio.get_running_loop().create_future()
+
+            async def send(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                elif not message.get("more_body"):
+                    # A slow client: the app waits, but holds no thread.
+                    await asyncio.sleep(delay)
+
+            await application(scope, receive, send)
+            return status
+
+        async def run():
+            pending = asyncio.Queue()
+            for item in requests:
+                pending.put_nowait(item)
+            timings, statuses = [], {}
+
+            async def client():
+                while not pending.empty():
+                    path, authorization = pending.get_nowait()
+                    start = time.perf_counter()
+                    status = await request(path, authorization)
+                    timings.append(time.perf_counter() - start)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client() for _ in range(clients)))
+            return time.perf_counter() - start, timings, statuses
+
+        return {"clients": clients, **self.report(*asyncio.run(run()))}
+
+    def bench_wsgi(self, requests, workers, delay):
+        application = get_wsgi_application()
+
+        def request(item):
+            path, authorization = item
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "SCRIPT_NAME": "",
+                "PATH_INFO": path,
+                "QUERY_STRING": "",
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": "testserver",
+                "HTTP_AUTHORIZATION": authorization,
+                "REMOTE_ADDR": "127.0.0.1",
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "http",
+                "wsgi.input": BytesIO(),
+                "wsgi.errors": BytesIO(),
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+            status = None
+
+            def start_response(status_line, headers, exc_info=None):
+                nonlocal status
+                status = int(status_line.split()[0])
+
+            start = time.perf_counter()
+            response = application(environ, start_response)
+            try:
+                b"".join(response)
+                # A slow client: the worker thread is stuck writing to it.
+                time.sleep(delay)
+            finally:
+                response.close()
+            return time.perf_counter() - start, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(request, requests))
+        elapsed = time.perf_counter() - start
+
+        statuses = {}
+        for _, status in outcomes:
+            statuses[status] = statuses.get(status, 0) + 1
+        timings = [timing for timing, _ in outcomes]
+        return {"workers": workers, **self.report(elapsed, timings, statuses)}
@@ -0,0 +1,138 @@
+import json
+import resource
+import sys
+import time
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from polls.benchmarks import benchmark_database
+from polls.benchmarks.data import BATCH_SIZE
+from polls.models import Choice, Poll, Vote
+
+CHOICES = 10
+
+
+def peak_rss_kib():
+    """High-water resident set size of this process, in KiB."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def reset_peak_rss():
+    """Start a new RSS high-water mark, where Linux allows it."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the vote export of one poll as it grows through --votes sizes "
+        "and report throughput and the peak RSS of each export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--votes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000, 10_000_000],
+            dest="sizes",
+        )
+        parser.add_argument("--output-format", choices=["csv", "ndjson"], default="csv")
+        parser.add_argument("--database")
+
+    def handle(self, *args, sizes, output_format, database, **options):
+        results = []
+        with benchmark_database(database):
+            owner = User.objects.create_user("export-owner")
+            poll = Poll.objects.create(
+                question="Exported poll?",
+                user=owner,
+                allows_multiple_choices=True,
+                deadline=timezone.now() + timedelta(days=1),
+            )
+            choices = Choice.objects.bulk_create(
+                Choice(poll=poll, choice_txt=f"Option {j}") for j in range(CHOICES)
+            )
+            client = APIClient()
+            client.force_authenticate(owner)
+
+            seeded = 0
+            for size in sorted(sizes):
+                self.seed_votes(poll, choices, seeded, size)
+                seeded = size
+                results.append(self.export(client, poll, size, output_format))
+                self.stderr.write(json.dumps(results[-1]))
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def seed_votes(self, poll, choices, start, end):
+        """Add votes ``start`` to ``end``: every voter picks each choice in turn."""
+        first_voter, voters = start // CHOICES, -(-end // CHOICES)
+        self.bulk_create(
+            User,
+            (
+                User(username=f"exported-{i}")
+                for i in range(-(-start // CHOICES), voters)
+            ),
+        )
+        voter_ids = (
+            User.objects.filter(username__startswith="exported-")
+            .order_by("id")
+            .values_list("id", flat=True)[first_voter:voters]
+        )
+        self.bulk_create(
+            Vote,
+            (
+                Vote(user_id=voter_id, poll=poll, choice=choice)
+                for index, voter_id in enumerate(
+                    voter_ids.iterator(chunk_size=BATCH_SIZE), first_voter
+                )
+                for j, choice in enumerate(choices)
+                if start <= index * CHOICES + j < end
+            ),
+        )
+
+    def bulk_create(self, model, objs):
+        # bulk_create() would hold every object in memory at once.
+        while batch := list(islice(objs, BATCH_SIZE)):
+            model.objects.bulk_create(batch)
+
+    def export(self, client, poll, size, output_format):
+        exact = reset_peak_rss()
+        before = peak_rss_kib()
+
+        start = time.perf_counter()
+        response = client.get(
+            f"/polls/api/polls/{poll.id}/export/", {"output": output_format}
+        )
+        rows = sent = 0
+        for chunk in response.streaming_content:
+            sent += len(chunk)
+            rows += chunk.count(b"\n")
+        elapsed = time.perf_counter() - start
+
+        return {
+            "votes": size,
+            "rows": rows - (output_format == "csv"),
+            "bytes": sent,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_sec": round(size / elapsed),
+            "peak_rss_mib": round(peak_rss_kib() / 1024, 1),
+            "peak_rss_growth_mib": round((peak_rss_kib() - before) / 1024, 1),
+            "peak_rss_reset": exact,
+        }
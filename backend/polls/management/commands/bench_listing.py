@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from polls.api.polls.listing import POLL_VALUES, render_json, serialize_polls
+from polls.api.polls.serializers import PollSerializer
+from polls.benchmarks import benchmark_database, best_of, seed_polls
+from polls.counters import prefetch_choices
+from polls.models import Poll
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the fast poll listing path with "
+        "PollSerializer + CamelCaseJSONRenderer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--polls", type=int, nargs="+", default=[1000, 10000], dest="sizes"
+        )
+        parser.add_argument("--choices", type=int, default=4)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, sizes, choices, repeat, **options):
+        results = []
+        with benchmark_database():
+            seeded = 0
+            for size in sorted(sizes):
+                seed_polls(size - seeded, choices)
+                seeded = size
+                results.append(self.run(size, repeat))
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, size, repeat):
+        polls = Poll.objects.order_by("-created_at", "-id")[:size]
+
+        def serializer_path():
+            data = PollSerializer(
+                polls.select_related("user").prefetch_related(prefetch_choices()),
+                many=True,
+            ).data
+            return CamelCaseJSONRenderer().render(data)
+
+        def fast_path():
+            return render_json(serialize_polls(polls.values(*POLL_VALUES)))
+
+        if json.loads(serializer_path()) != json.loads(fast_path()):
+            raise CommandError("The fast path output differs from PollSerializer's.")
+
+        serializer_time = best_of(repeat, serializer_path)
+        fast_time = best_of(repeat, fast_path)
+        return {
+            "polls": size,
+            "serializer_polls_per_sec": round(size / serializer_time),
+            "fast_polls_per_sec": round(size / fast_time),
+            "speedup": round(serializer_time / fast_time, 2),
+        }
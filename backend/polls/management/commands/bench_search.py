@@ -0,0 +1,137 @@
+import json
+import random
+import string
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from polls.benchmarks import benchmark_database, summarize
+from polls.benchmarks.data import BATCH_SIZE
+from polls.models import Choice, Poll
+from polls.search import get_search_backend, index_polls, search_terms
+
+
+def vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))))
+    # Shuffled, so that the commonest words do not share prefixes.
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed --polls polls worded from a skewed vocabulary, index them and "
+        "report search latency for rare, common, prefix and multi-word "
+        "queries, against a question__icontains scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--polls", type=int, default=1_000_000)
+        parser.add_argument("--words", type=int, default=20_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument(
+            "--backend",
+            default="",
+            help="Dotted path of the search backend (default: POLLS_SEARCH_BACKEND).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--database")
+
+    def handle(self, *args, database, backend, **options):
+        rng = random.Random(options["seed"])
+        words = vocabulary(options["words"], rng)
+        with benchmark_database(database), override_settings(
+            POLLS_SEARCH_BACKEND=backend
+        ):
+            get_search_backend.cache_clear()
+            start = time.perf_counter()
+            self.seed(options["polls"], words, rng)
+            seeded = time.perf_counter()
+            index_polls(Poll.objects.order_by("id"))
+            indexed = time.perf_counter()
+            self.stderr.write(
+                f"Seeded in {seeded - start:.1f}s, indexed in {indexed - seeded:.1f}s"
+            )
+            result = {
+                "polls": options["polls"],
+                "backend": type(get_search_backend()).__name__,
+                "index_seconds": round(indexed - seeded, 1),
+                **self.run(words, options["queries"], rng),
+            }
+        get_search_backend.cache_clear()
+
+        self.stdout.write(json.dumps(result, indent=2))
+
+    def word(self, words, rng):
+        # Skewed: the first words of the vocabulary are by far the commonest.
+        return words[int(len(words) * rng.random() ** 4)]
+
+    def seed(self, count, words, rng):
+        user = User.objects.create_user("search-owner")
+        now = timezone.now()
+        polls = (
+            Poll(
+                question=" ".join(self.word(words, rng) for _ in range(6)) + "?",
+                user=user,
+                created_at=now - timedelta(seconds=i),
+                deadline=now + timedelta(days=30),
+            )
+            for i in range(count)
+        )
+        while batch := list(islice(polls, BATCH_SIZE)):
+            Choice.objects.bulk_create(
+                Choice(poll=poll, choice_txt=f"{self.word(words, rng)} {j}")
+                for poll in Poll.objects.bulk_create(batch)
+                for j in range(2)
+            )
+
+    def run(self, words, count, rng):
+        queries = {
+            "rare": lambda: words[rng.randrange(len(words) // 2, len(words))],
+            "common": lambda: words[rng.randrange(10)],
+            "prefix": lambda: self.word(words, rng)[: rng.randint(2, 4)],
+            "two_words": lambda: f"{words[rng.randrange(100)]} "
+            f"{self.word(words, rng)[:3]}",
+        }
+        client = APIClient()
+        backend = get_search_backend()
+        results = {}
+        for kind, query in queries.items():
+            index_timings, endpoint_timings = [], []
+            for _ in range(count):
+                q = query()
+                start = time.perf_counter()
+                backend.search(search_terms(q), 0, 20)
+                index_timings.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                response = client.get("/polls/api/polls/search/", {"q": q})
+                endpoint_timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise CommandError(f"Searching {q!r} failed: {response.content}")
+            results[kind] = {
+                "index": summarize(index_timings),
+                "endpoint": summarize(endpoint_timings),
+            }
+
+        icontains_timings = []
+        for _ in range(min(count, 20)):
+            q = queries["rare"]()
+            start = time.perf_counter()
+            list(
+                Poll.objects.filter(question__icontains=q)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)[:20]
+            )
+            icontains_timings.append(time.perf_counter() - start)
+        results["rare_icontains"] = summarize(icontains_timings)
+        return results
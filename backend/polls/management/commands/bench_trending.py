@@ -0,0 +1,137 @@
+import heapq
+import json
+import math
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from polls.benchmarks import benchmark_database, summarize
+from polls.benchmarks.data import BATCH_SIZE
+from polls.models import Poll
+from polls.trending import TrendingRanking, log_add, score_at
+
+
+class Command(BaseCommand):
+    help = (
+        "Feed a sustained stream of ballots over --polls polls to the trending "
+        "ranking and report the latency of recording ballots, of top-N reads "
+        "and of syncs with the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--polls", type=int, default=1_000_000)
+        parser.add_argument("--ballots", type=int, default=1_000_000)
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=1000,
+            help="Ballots per second of simulated time.",
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=4,
+            help="Higher values concentrate ballots on fewer polls.",
+        )
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--size", type=int, default=1000)
+        parser.add_argument("--half-life", type=float, default=3600)
+        parser.add_argument(
+            "--sync-every",
+            type=int,
+            default=10_000,
+            help="Ballots between two syncs with the database.",
+        )
+        parser.add_argument("--read-every", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--database")
+
+    def handle(self, *args, database, **options):
+        with benchmark_database(database):
+            start = time.perf_counter()
+            poll_ids = self.seed(options["polls"])
+            self.stderr.write(
+                f"Seeded {len(poll_ids)} polls in {time.perf_counter() - start:.1f}s"
+            )
+            result = self.run(poll_ids, **options)
+
+        self.stdout.write(json.dumps(result, indent=2))
+
+    def seed(self, count):
+        user = User.objects.create_user("trending-owner")
+        now = timezone.now()
+        for start in range(0, count, BATCH_SIZE):
+            Poll.objects.bulk_create(
+                Poll(
+                    question=f"Trending poll #{i}?",
+                    user=user,
+                    created_at=now,
+                    deadline=now + timedelta(days=30),
+                )
+                for i in range(start, min(start + BATCH_SIZE, count))
+            )
+        return list(Poll.objects.order_by("id").values_list("id", flat=True))
+
+    def run(
+        self,
+        poll_ids,
+        ballots,
+        rate,
+        skew,
+        top,
+        size,
+        half_life,
+        sync_every,
+        read_every,
+        seed,
+        **options,
+    ):
+        rng = random.Random(seed)
+        # Syncs only happen when asked for below, so that they are timed apart.
+        ranking = TrendingRanking(half_life, size, sync_interval=None)
+        ranking.sync()
+        expected = {}
+
+        record_timings, read_timings, sync_timings = [], [], []
+        now = time.time()
+        started = time.perf_counter()
+        for i in range(1, ballots + 1):
+            poll_id = poll_ids[int(len(poll_ids) * rng.random() ** skew)]
+            at = now + i / rate
+            expected[poll_id] = log_add(expected.get(poll_id), score_at(at, half_life))
+
+            start = time.perf_counter()
+            ranking.record(poll_id, at)
+            record_timings.append(time.perf_counter() - start)
+
+            if i % read_every == 0:
+                start = time.perf_counter()
+                ranking.top(top)
+                read_timings.append(time.perf_counter() - start)
+            if i % sync_every == 0:
+                start = time.perf_counter()
+                ranking.sync()
+                sync_timings.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+
+        ranking.sync()
+        # Compared by score: summing in another order may swap near ties.
+        best = heapq.nlargest(top, expected.values())
+        ranked = [score for _, score in ranking.top(top)]
+        if len(ranked) != len(best) or not all(map(math.isclose, ranked, best)):
+            raise CommandError("The ranking differs from the exact top polls.")
+
+        return {
+            "polls": len(poll_ids),
+            "ballots": ballots,
+            "voted_polls": len(expected),
+            "simulated_seconds": round(ballots / rate),
+            "ballots_per_sec": round(ballots / elapsed),
+            "record": summarize(record_timings),
+            "top": summarize(read_timings),
+            "sync": summarize(sync_timings),
+        }
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from polls.histograms import compact_vote_buckets
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold vote histogram buckets past their retention into coarser ones: "
+        "minutes into hours, hours into days. With --loop, keep running and "
+        "compact every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=600.0,
+            help="Seconds between two passes with --loop.",
+        )
+
+    def handle(self, *args, loop=False, interval=600.0, **options):
+        while True:
+            folded = compact_vote_buckets()
+            if folded or not loop:
+                self.stdout.write(f"Compacted {folded} bucket(s).")
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from polls.expiry import finalize_due_polls, next_deadline
+
+
+class Command(BaseCommand):
+    help = (
+        "Finalize the polls whose deadline has passed: freeze their results, "
+        "mark them expired and, if POLLS_CACHE_BACKEND is shared, warm their "
+        "cache. With --loop, keep running "
+        "and finalize polls as their deadlines pass."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30.0,
+            help="Longest sleep between two passes with --loop, in seconds.",
+        )
+
+    def handle(self, *args, loop=False, interval=30.0, **options):
+        while True:
+            finalized = finalize_due_polls()
+            if finalized or not loop:
+                self.stdout.write(f"Finalized {finalized} poll(s).")
+            if not loop:
+                return
+
+            # Wake up when the next poll is due, unless that is further away.
+            upcoming = next_deadline()
+            delay = interval
+            if upcoming is not None:
+                due_in = (upcoming - timezone.now()).total_seconds()
+                delay = min(interval, due_in + settings.POLLS_FINALIZE_GRACE_SECONDS)
+            time.sleep(max(delay, 1.0))
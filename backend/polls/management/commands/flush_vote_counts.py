@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from polls.counters import get_vote_counter
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold the counter shards of ShardedVoteCounter into Choice.vote_count "
+        "and the poll totals. Other counters have nothing to fold from here: "
+        "BufferedVoteCounter keeps its increments in each web process, which "
+        "flushes them itself."
+    )
+
+    def handle(self, *args, **options):
+        get_vote_counter().flush()
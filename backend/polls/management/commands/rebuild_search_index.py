@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from polls.models import Poll
+from polls.search import get_search_backend, index_polls
+
+
+class Command(BaseCommand):
+    help = "Rebuild the poll search index from the polls and their choices."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            backend.clear()
+            indexed = index_polls(Poll.objects.order_by("id"))
+
+        self.stdout.write(f"Indexed {indexed} poll(s) with {type(backend).__name__}.")
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from polls.counters import get_vote_counter
+from polls.models import Choice, ChoiceCounterShard, Vote
+
+
+class Command(BaseCommand):
+    help = "Rebuild Choice.vote_count from the recorded Vote rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll",
+            type=int,
+            action="append",
+            dest="polls",
+            help="Only reconcile this poll (can be repeated).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted counters without rewriting them.",
+        )
+
+    def handle(self, *args, polls=None, dry_run=False, **options):
+        recorded = Coalesce(
+            Subquery(
+                Vote.objects.filter(choice=OuterRef("pk"))
+                .values("choice")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        choices = Choice.objects.all()
+        if polls:
+            choices = choices.filter(poll_id__in=polls)
+
+        with transaction.atomic():
+            drifted = (
+                get_vote_counter()
+                .choices()
+                .filter(pk__in=choices.values("pk"))
+                .annotate(recorded=recorded)
+                .exclude(recorded=F("vote_count") + F("pending_vote_count"))
+                .count()
+            )
+            if not dry_run:
+                ChoiceCounterShard.objects.filter(choice__in=choices).delete()
+                choices.update(vote_count=recorded)
+
+        self.stdout.write(
+            f"{drifted} choice counter(s) out of sync with the recorded votes"
+            + ("." if dry_run else ", rebuilt.")
+        )
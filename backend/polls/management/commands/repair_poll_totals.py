@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from polls.counters import recorded_poll_totals
+from polls.models import Poll
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild Poll.total_votes and Poll.unique_voters from the recorded Vote rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll",
+            type=int,
+            action="append",
+            dest="polls",
+            help="Only repair this poll (can be repeated).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted totals without rewriting them.",
+        )
+
+    def handle(self, *args, polls=None, dry_run=False, **options):
+        totals = recorded_poll_totals()
+        queryset = Poll.objects.all()
+        if polls:
+            queryset = queryset.filter(id__in=polls)
+
+        with transaction.atomic():
+            drifted = (
+                queryset.select_for_update()
+                .annotate(
+                    recorded_total_votes=totals["total_votes"],
+                    recorded_unique_voters=totals["unique_voters"],
+                )
+                .exclude(
+                    Q(total_votes=F("recorded_total_votes"))
+                    & Q(unique_voters=F("recorded_unique_voters"))
+                )
+            )
+            drifted_ids = list(drifted.values_list("id", flat=True))
+            if not dry_run and drifted_ids:
+                Poll.objects.filter(id__in=drifted_ids).update(**totals)
+
+        self.stdout.write(
+            f"{len(drifted_ids)} poll total(s) out of sync with the recorded votes"
+            + ("." if dry_run else ", rebuilt.")
+        )
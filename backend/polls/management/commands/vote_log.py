@@ -0,0 +1,220 @@
+import csv
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Min, Q
+
+from polls.cache import invalidate_poll
+from polls.counters import get_vote_counter
+from polls.models import Choice, ChoiceCounterShard, Poll
+from polls.votelog import (
+    compact,
+    log_start,
+    read_log,
+    tally,
+    voters,
+    write_columnar,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Work with the vote log in POLLS_VOTE_LOG_DIR: verify Choice.vote_count "
+        "against it or rebuild vote counts from it, export per-choice results, "
+        "or compact its sealed segments."
+    )
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest="action", required=True)
+
+        verify = actions.add_parser(
+            "verify", help="Report vote counters that disagree with the log."
+        )
+        rebuild = actions.add_parser(
+            "rebuild",
+            help="Rewrite the vote counters and totals of the polls whose votes "
+            "were all cast since the log started from it.",
+        )
+        rebuild.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the counters that would change without rewriting them.",
+        )
+        export = actions.add_parser(
+            "export", help="Write the votes per choice recorded in the log."
+        )
+        for action in (verify, rebuild, export):
+            action.add_argument(
+                "--poll",
+                type=int,
+                action="append",
+                dest="polls",
+                help="Only consider this poll (can be repeated).",
+            )
+        export.add_argument("output", help="File to write.")
+        export.add_argument("--format", choices=["csv", "columnar"], default="csv")
+
+        actions.add_parser(
+            "compact",
+            help="Merge sealed segments, dropping votes for deleted choices.",
+        )
+
+    def handle(self, *args, action, **options):
+        if not settings.POLLS_VOTE_LOG_DIR:
+            raise CommandError("POLLS_VOTE_LOG_DIR is not set.")
+        getattr(self, action)(**options)
+
+    def logged_counts(self, polls):
+        polls = set(polls) if polls else None
+        return tally(read_log(settings.POLLS_VOTE_LOG_DIR), polls)
+
+    def choices(self, polls):
+        choices = get_vote_counter().choices()
+        if polls:
+            choices = choices.filter(poll_id__in=polls)
+        return choices
+
+    def verify(self, polls=None, **options):
+        logged = self.logged_counts(polls)
+        drifted = 0
+        for choice in self.choices(polls).iterator(chunk_size=2000):
+            expected = logged.get((choice.poll_id, choice.id), 0)
+            if expected != choice.current_vote_count:
+                drifted += 1
+                self.stdout.write(
+                    f"Choice {choice.id} of poll {choice.poll_id}: "
+                    f"{choice.current_vote_count} counted, {expected} logged"
+                )
+
+        if drifted:
+            raise CommandError(
+                f"{drifted} choice counter(s) out of sync with the vote log."
+            )
+        self.stdout.write("Vote counters match the vote log.")
+
+    def rebuild(self, polls=None, dry_run=False, **options):
+        covered, skipped = self.covered_polls(polls)
+        if skipped:
+            self.stdout.write(
+                f"Skipping {len(skipped)} poll(s) with votes from before the "
+                f"log started: {', '.join(map(str, sorted(skipped)))}"
+            )
+        if not covered:
+            self.stdout.write("No poll to rebuild.")
+            return
+
+        logged = tally(read_log(settings.POLLS_VOTE_LOG_DIR), covered)
+        logged_voters = voters(read_log(settings.POLLS_VOTE_LOG_DIR), covered)
+
+        changed = set()
+        choices = defaultdict(list)
+        for choice in self.choices(covered).iterator(chunk_size=2000):
+            counted = choice.current_vote_count
+            choice.vote_count = logged.get((choice.poll_id, choice.id), 0)
+            if choice.vote_count != counted:
+                changed.add(choice.poll_id)
+                self.stdout.write(
+                    f"Choice {choice.id} of poll {choice.poll_id}: "
+                    f"{counted} -> {choice.vote_count}"
+                )
+            choices[choice.poll_id].append(choice)
+
+        rebuilt_polls = []
+        for poll in Poll.objects.filter(id__in=covered).only(
+            "total_votes", "unique_voters", "results"
+        ):
+            totals = (
+                sum(choice.vote_count for choice in choices[poll.id]),
+                logged_voters[poll.id],
+            )
+            if (poll.total_votes, poll.unique_voters) != totals:
+                changed.add(poll.id)
+                self.stdout.write(
+                    f"Poll {poll.id}: {poll.total_votes} vote(s) from "
+                    f"{poll.unique_voters} voter(s) -> {totals[0]} from {totals[1]}"
+                )
+            poll.total_votes, poll.unique_voters = totals
+            if poll.results is not None:
+                # Finalized: its frozen counts are the ones served.
+                poll.results = {
+                    str(choice.id): choice.vote_count for choice in choices[poll.id]
+                }
+            rebuilt_polls.append(poll)
+
+        if dry_run:
+            self.stdout.write(f"{len(changed)} poll(s) out of sync with the vote log.")
+            return
+
+        with transaction.atomic():
+            ChoiceCounterShard.objects.filter(choice__poll_id__in=covered).delete()
+            Choice.objects.bulk_update(
+                [
+                    choice
+                    for poll_choices in choices.values()
+                    for choice in poll_choices
+                ],
+                ["vote_count"],
+                batch_size=2000,
+            )
+            Poll.objects.bulk_update(
+                rebuilt_polls,
+                ["total_votes", "unique_voters", "results"],
+                batch_size=2000,
+            )
+            for poll_id in changed:
+                transaction.on_commit(partial(invalidate_poll, poll_id))
+
+        self.stdout.write(
+            f"Rebuilt the vote counters of {len(covered)} poll(s) from the vote "
+            f"log, {len(changed)} of which changed."
+        )
+
+    def covered_polls(self, polls):
+        """
+        The ids of the polls whose votes were all cast since the log started,
+        and those of the others.
+        """
+        start = log_start(settings.POLLS_VOTE_LOG_DIR)
+        queryset = Poll.objects.annotate(first_vote=Min("vote__created_at"))
+        if polls:
+            queryset = queryset.filter(id__in=polls)
+        covered = Q(first_vote__isnull=True)
+        if start is not None:
+            covered |= Q(
+                first_vote__gte=datetime.fromtimestamp(start / 1e6, dt_timezone.utc)
+            )
+        return (
+            set(queryset.filter(covered).values_list("id", flat=True)),
+            set(queryset.exclude(covered).values_list("id", flat=True)),
+        )
+
+    def export(self, output, format, polls=None, **options):
+        rows = sorted(self.logged_counts(polls).items())
+        columns = {
+            "poll_id": [poll_id for (poll_id, _), _ in rows],
+            "choice_id": [choice_id for (_, choice_id), _ in rows],
+            "votes": [votes for _, votes in rows],
+        }
+
+        if format == "csv":
+            with open(output, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                writer.writerows(zip(*columns.values()))
+        else:
+            write_columnar(output, columns)
+
+        self.stdout.write(f"Exported {len(rows)} choice(s) to {output}.")
+
+    def compact(self, **options):
+        existing = set(Choice.objects.values_list("id", flat=True))
+        result = compact(settings.POLLS_VOTE_LOG_DIR, existing.__contains__)
+        (segments, compacted), (votes, kept) = result["segments"], result["records"]
+        self.stdout.write(
+            f"Compacted {segments} segment(s) holding {votes} vote(s) "
+            f"into {compacted} holding {kept}."
+        )
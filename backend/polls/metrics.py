@@ -0,0 +1,74 @@
+import bisect
+import math
+import threading
+
+# Upper bounds of the histogram buckets, in milliseconds for durations.
+DURATION_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, math.inf)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        return {
+            "buckets": {
+                "+Inf" if bound == math.inf else str(bound): count
+                for bound, count in zip(self.buckets, self.counts)
+            },
+            "count": self.count,
+            "sum": round(self.sum, 3),
+        }
+
+
+class RequestMetrics:
+    """Per URL name histograms of the request timings recorded in-process."""
+
+    fields = {
+        "total_ms": DURATION_BUCKETS,
+        "app_ms": DURATION_BUCKETS,
+        "db_ms": DURATION_BUCKETS,
+        "render_ms": DURATION_BUCKETS,
+        "queries": QUERY_BUCKETS,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, url_name, **values):
+        with self._lock:
+            histograms = self._histograms.get(url_name)
+            if histograms is None:
+                histograms = self._histograms[url_name] = {
+                    field: Histogram(buckets) for field, buckets in self.fields.items()
+                }
+            for field, value in values.items():
+                histograms[field].observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                url_name: {
+                    field: histogram.as_dict()
+                    for field, histogram in histograms.items()
+                    if histogram.count
+                }
+                for url_name, histograms in self._histograms.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+request_metrics = RequestMetrics()
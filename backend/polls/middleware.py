@@ -0,0 +1,130 @@
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import request_metrics
+
+# Timer of the request being served. Context variables follow a request into
+# the threads its async views run their queries in, where connections are not
+# the ones of the event loop's thread.
+_request_timer = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self._render_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def start_render(self):
+        self._render_start = time.perf_counter()
+
+    def end_render(self, response):
+        self.render += time.perf_counter() - self._render_start
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Reconnecting keeps the wrappers of the connection object.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+class InstrumentationMiddleware:
+    """
+    Times a sample of requests (``POLLS_METRICS_SAMPLE_RATE``): query count,
+    time spent in the database, in rendering the response and in the rest of
+    the view (mostly serialization). Timings are reported in a
+    ``Server-Timing`` header and aggregated per URL name into
+    ``polls.metrics.request_metrics``. Sync and async views alike: queries
+    are timed on every connection, in whichever thread they run.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        request._timer = timer = RequestTimer()
+        token = _request_timer.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        return self.report(request, response, timer)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        request._timer = timer = RequestTimer()
+        token = _request_timer.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        return self.report(request, response, timer)
+
+    def process_template_response(self, request, response):
+        timer = getattr(request, "_timer", None)
+        if timer is not None:
+            timer.start_render()
+            response.add_post_render_callback(timer.end_render)
+        return response
+
+    def sampled(self):
+        return random.random() < settings.POLLS_METRICS_SAMPLE_RATE
+
+    def report(self, request, response, timer):
+        total = time.perf_counter() - timer.start
+        app = max(total - timer.db - timer.render, 0)
+        url_name = getattr(request.resolver_match, "url_name", None) or "unresolved"
+        request_metrics.record(
+            url_name,
+            total_ms=total * 1000,
+            app_ms=app * 1000,
+            db_ms=timer.db * 1000,
+            render_ms=timer.render * 1000,
+            queries=timer.queries,
+        )
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={timer.db * 1000:.3f};desc="{timer.queries} queries"',
+                f"app;dur={app * 1000:.3f}",
+                f"render;dur={timer.render * 1000:.3f}",
+                f'total;dur={total * 1000:.3f};desc="{url_name}"',
+            ]
+        )
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0009_alter_poll_description_poll_deadline_not_in_past"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="poll_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 19:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0011_choicecountershard"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["user", "deadline"], name="poll_user_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                fields=["user", "created_at"], name="vote_user_created_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 19:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0012_poll_poll_user_deadline_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="results",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="status",
+            field=models.CharField(
+                choices=[("active", "Active"), ("expired", "Expired")],
+                default="active",
+                max_length=7,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="poll_status_created_at_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["status", "deadline"], name="poll_status_deadline_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 19:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_totals(apps, schema_editor):
+    Poll = apps.get_model("polls", "Poll")
+    Vote = apps.get_model("polls", "Vote")
+    votes = Vote.objects.filter(poll=OuterRef("pk")).values("poll")
+    Poll.objects.update(
+        total_votes=Coalesce(
+            Subquery(votes.annotate(total=Count("id")).values("total")), 0
+        ),
+        unique_voters=Coalesce(
+            Subquery(
+                votes.annotate(total=Count("user", distinct=True)).values("total")
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0013_poll_status_results"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="total_votes",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="unique_voters",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_totals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["-total_votes", "-id"], name="poll_total_votes_idx"
+            ),
+        ),
+    ]
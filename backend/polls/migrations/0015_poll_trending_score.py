@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 19:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0014_poll_totals"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="trending_score",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                condition=models.Q(("trending_score__isnull", False)),
+                fields=["-trending_score"],
+                name="poll_trending_score_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_fts5_table(apps, schema_editor):
+    # Elsewhere, polls.search falls back to SearchTerm rows, which the
+    # rebuild_search_index command fills in.
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        if ("ENABLE_FTS5",) not in cursor.fetchall():
+            return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE polls_poll_search USING fts5("
+        "question, choices, content='', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+    )
+    schema_editor.execute(
+        "INSERT INTO polls_poll_search (rowid, question, choices) "
+        "SELECT id, question, ("
+        "  SELECT group_concat(choice_txt, ' ') FROM polls_choice"
+        "  WHERE poll_id = polls_poll.id"
+        ") FROM polls_poll"
+    )
+
+
+def drop_fts5_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS polls_poll_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0015_poll_trending_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("in_question", models.BooleanField()),
+                (
+                    "poll",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="polls.poll"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("term", "poll"), name="unique_term_per_poll"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_fts5_table, drop_fts5_table),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 20:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def flag_single_choice_votes(apps, schema_editor):
+    # Single-choice polls were not enforced across ballots before: only the
+    # first vote of each user is flagged, leaving any later ones as they are.
+    Vote = apps.get_model("polls", "Vote")
+    first_votes = (
+        Vote.objects.filter(poll__allows_multiple_choices=False)
+        .values("user", "poll")
+        .annotate(first=Min("id"))
+        .values("first")
+    )
+    Vote.objects.filter(id__in=first_votes).update(single_choice=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0016_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vote",
+            name="single_choice",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(flag_single_choice_votes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="vote",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("single_choice", True)),
+                fields=("user", "poll"),
+                name="unique_vote_per_single_choice_poll",
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2 on 2026-10-18 20:52
+
+from datetime import timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMinute
+
+
+def count_recorded_votes(apps, schema_editor):
+    # Into minute buckets: compact_vote_histograms folds the old ones.
+    Vote = apps.get_model("polls", "Vote")
+    VoteBucket = apps.get_model("polls", "VoteBucket")
+    buckets = (
+        Vote.objects.annotate(start=TruncMinute("created_at", tzinfo=timezone.utc))
+        .values("poll_id", "choice_id", "start")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    VoteBucket.objects.bulk_create(
+        (VoteBucket(resolution="minute", **bucket) for bucket in buckets.iterator()),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0017_vote_single_choice"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoteBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[
+                            ("minute", "Minute"),
+                            ("hour", "Hour"),
+                            ("day", "Day"),
+                        ],
+                        max_length=6,
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "choice",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vote_buckets",
+                        to="polls.choice",
+                    ),
+                ),
+                (
+                    "poll",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="polls.poll"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["poll", "resolution", "start"],
+                        name="vote_bucket_poll_idx",
+                    ),
+                    models.Index(
+                        fields=["resolution", "start"],
+                        name="vote_bucket_resolution_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("choice", "resolution", "start"),
+                        name="unique_bucket_per_choice",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_recorded_votes, migrations.RunPython.noop),
+    ]
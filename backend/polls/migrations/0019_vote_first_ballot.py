@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 21:17
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def flag_first_ballots(apps, schema_editor):
+    # The earliest vote of each user on each poll stands for their first
+    # ballot.
+    Vote = apps.get_model("polls", "Vote")
+    first_votes = Vote.objects.values("user", "poll").annotate(first=Min("id"))
+    Vote.objects.filter(id__in=first_votes.values("first")).update(first_ballot=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0018_vote_buckets"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="choicecountershard",
+            name="voters",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vote",
+            name="first_ballot",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(flag_first_ballots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="vote",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("first_ballot", True)),
+                fields=("user", "poll"),
+                name="unique_first_ballot_per_poll",
+            ),
+        ),
+    ]
@@ -1,3 +1,6 @@
 from .poll import Poll
 from .choice import Choice
 from .vote import Vote
+from .choice_counter_shard import ChoiceCounterShard
+from .search_term import SearchTerm
+from .vote_bucket import VoteBucket
@@ -7,5 +7,11 @@ class Choice(models.Model):
     choice_txt = models.CharField(max_length=50)
     vote_count = models.PositiveIntegerField(default=0)
 
+    @property
+    def current_vote_count(self):
+        # Increments not yet folded into vote_count, when the choice was
+        # loaded through the vote counter (see polls.counters).
+        return self.vote_count + getattr(self, "pending_vote_count", 0)
+
     def __str__(self):
         return self.choice_txt
@@ -0,0 +1,20 @@
+from django.db import models
+from .choice import Choice
+
+
+class ChoiceCounterShard(models.Model):
+    choice = models.ForeignKey(
+        Choice, on_delete=models.CASCADE, related_name="counter_shards"
+    )
+    shard = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    # New voters of the choice's poll, counted on the shard of the first
+    # choice of their ballot.
+    voters = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["choice", "shard"], name="unique_shard_per_choice"
+            )
+        ]
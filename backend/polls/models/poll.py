@@ -5,14 +5,45 @@ from django.db.models import Q, F
 
 
 class Poll(models.Model):
+    class Status(models.TextChoices):
+        ACTIVE = "active", "Active"
+        EXPIRED = "expired", "Expired"
+
     question = models.CharField(max_length=90)
     description = models.CharField(max_length=220, default="", blank=True)
     allows_multiple_choices = models.BooleanField(default=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField("Published on", default=timezone.now)
     deadline = models.DateTimeField("Ends on")
+    # Set by polls.expiry once the deadline has passed, along with the final
+    # vote counts per choice id.
+    status = models.CharField(max_length=7, choices=Status, default=Status.ACTIVE)
+    results = models.JSONField(null=True, blank=True, editable=False)
+    # Maintained by the vote counter (see polls.counters), rebuilt by
+    # repair_poll_totals.
+    total_votes = models.PositiveIntegerField(default=0, editable=False)
+    unique_voters = models.PositiveIntegerField(default=0, editable=False)
+    # Ranks the poll among trending ones while it is active, see polls.trending.
+    trending_score = models.FloatField(null=True, blank=True, editable=False)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="poll_created_at_id_idx"),
+            models.Index(fields=["user", "deadline"], name="poll_user_deadline_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="poll_status_created_at_idx",
+            ),
+            models.Index(
+                fields=["status", "deadline"], name="poll_status_deadline_idx"
+            ),
+            models.Index(fields=["-total_votes", "-id"], name="poll_total_votes_idx"),
+            models.Index(
+                fields=["-trending_score"],
+                name="poll_trending_score_idx",
+                condition=Q(trending_score__isnull=False),
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 condition=Q(deadline__gt=F("created_at")), name="deadline_not_in_past"
@@ -21,7 +52,7 @@ class Poll(models.Model):
 
     @property
     def is_active(self):
-        return self.deadline > timezone.now()
+        return self.status == self.Status.ACTIVE and self.deadline > timezone.now()
 
     def __str__(self):
         return self.question
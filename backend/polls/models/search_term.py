@@ -0,0 +1,18 @@
+from django.db import models
+from .poll import Poll
+
+
+class SearchTerm(models.Model):
+    """A word of a poll's question or choices, for polls.search."""
+
+    term = models.CharField(max_length=64)
+    poll = models.ForeignKey(Poll, on_delete=models.CASCADE)
+    # Whether the word appears in the question, not only in choices.
+    in_question = models.BooleanField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["term", "poll"], name="unique_term_per_poll"
+            )
+        ]
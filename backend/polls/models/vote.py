@@ -10,10 +10,29 @@ class Vote(models.Model):
     poll = models.ForeignKey(Poll, on_delete=models.CASCADE)
     choice = models.ForeignKey(Choice, on_delete=models.CASCADE)
     created_at = models.DateTimeField(default=timezone.now)
+    # Whether the poll allows a single choice, copied from it so that the
+    # database can refuse a second vote of the same user.
+    single_choice = models.BooleanField(default=False, editable=False)
+    # Set on one vote of the user's first ballot on the poll, so that the
+    # database tells which of two concurrent ballots made them a new voter.
+    first_ballot = models.BooleanField(default=False, editable=False)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="vote_user_created_at_idx")
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["user", "poll", "choice"], name="unique_vote_per_poll"
-            )
+            ),
+            models.UniqueConstraint(
+                fields=["user", "poll"],
+                condition=models.Q(single_choice=True),
+                name="unique_vote_per_single_choice_poll",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "poll"],
+                condition=models.Q(first_ballot=True),
+                name="unique_first_ballot_per_poll",
+            ),
         ]
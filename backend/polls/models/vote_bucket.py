@@ -0,0 +1,39 @@
+from django.db import models
+from .poll import Poll
+from .choice import Choice
+
+
+class VoteBucket(models.Model):
+    """
+    Votes a choice received during the ``resolution``-long stretch of time
+    starting at ``start`` (UTC), see polls.histograms.
+    """
+
+    class Resolution(models.TextChoices):
+        MINUTE = "minute", "Minute"
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    poll = models.ForeignKey(Poll, on_delete=models.CASCADE)
+    choice = models.ForeignKey(
+        Choice, on_delete=models.CASCADE, related_name="vote_buckets"
+    )
+    resolution = models.CharField(max_length=6, choices=Resolution)
+    start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["poll", "resolution", "start"], name="vote_bucket_poll_idx"
+            ),
+            models.Index(
+                fields=["resolution", "start"], name="vote_bucket_resolution_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["choice", "resolution", "start"],
+                name="unique_bucket_per_choice",
+            )
+        ]
@@ -0,0 +1,41 @@
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Calls ``func`` every ``interval`` seconds from a daemon thread of the
+    current process, so that work buffered in memory gets written out even
+    when no request comes to trigger it. The thread is started by the first
+    call to ``start``, in whichever process makes it; errors are logged and
+    the next run tries again.
+    """
+
+    def __init__(self, func, interval):
+        self.func = func
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            # Threads do not survive a fork: a forked worker starts its own.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"periodic:{self.func.__qualname__}"
+                )
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        event = threading.Event()
+        while not event.wait(self.interval):
+            close_old_connections()
+            try:
+                self.func()
+            except Exception:
+                logger.exception("%s failed", self.func.__qualname__)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from collections import Counter, defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .signals import votes_cast
+
+
+class InProcessBroker:
+    """
+    Fans vote count deltas out to the clients streaming a poll.
+
+    Deltas published from the (sync) vote path for polls streamed by this
+    process are only accumulated; a single ticker task running on the ASGI
+    event loop drains them every ``tick`` seconds, encodes one message per
+    poll and hands it to that poll's subscribers. Deltas for other polls are
+    dropped. A hot poll therefore costs one message per tick no matter how
+    many votes arrived in between.
+    """
+
+    max_queued_messages = 100
+
+    def __init__(self, tick=1.0):
+        self.tick = tick
+        self._lock = threading.Lock()
+        self._pending = defaultdict(Counter)
+        self._subscribers = defaultdict(set)
+        self._ticker = None
+
+    def publish(self, poll_id, deltas):
+        # Nobody to hand them to: new subscribers start from a snapshot, and
+        # without one (under WSGI, say) the buffer would only ever grow.
+        if poll_id not in self._subscribers:
+            return
+        with self._lock:
+            self._pending[poll_id].update(deltas)
+
+    def subscribe(self, poll_id, heartbeat=15.0):
+        """
+        Start buffering delta messages for ``poll_id`` right away, and return
+        a ``Subscription`` to read them from.
+        """
+        self._ensure_ticker()
+        queue = asyncio.Queue(maxsize=self.max_queued_messages)
+        self._subscribers[poll_id].add(queue)
+        return Subscription(self, poll_id, queue, heartbeat)
+
+    def unsubscribe(self, poll_id, queue):
+        self._subscribers[poll_id].discard(queue)
+        if not self._subscribers[poll_id]:
+            del self._subscribers[poll_id]
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+
+        for poll_id, deltas in pending.items():
+            queues = self._subscribers.get(poll_id)
+            if not queues:
+                continue
+            message = json.dumps(
+                {"poll": poll_id, "choices": {str(k): v for k, v in deltas.items()}}
+            )
+            for queue in queues:
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+
+    def _ensure_ticker(self):
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            self.flush()
+
+
+class Subscription:
+    """
+    Async iterator of the encoded delta messages of a poll, or ``None`` every
+    ``heartbeat`` seconds without one. Stops if the subscriber falls too far
+    behind, so that it reconnects and starts from a fresh snapshot. Close it
+    with ``aclose`` to unsubscribe.
+    """
+
+    def __init__(self, broker, poll_id, queue, heartbeat):
+        self.broker = broker
+        self.poll_id = poll_id
+        self.heartbeat = heartbeat
+        self._queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._queue is None:
+            raise StopAsyncIteration
+        try:
+            message = await asyncio.wait_for(self._queue.get(), self.heartbeat)
+        except asyncio.TimeoutError:
+            return None
+        if message is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return message
+
+    async def aclose(self):
+        if self._queue is not None:
+            self.broker.unsubscribe(self.poll_id, self._queue)
+            self._queue = None
+
+
+@cache
+def get_broker():
+    broker_class = import_string(settings.POLLS_STREAM_BROKER)
+    return broker_class(tick=settings.POLLS_STREAM_TICK)
+
+
+@receiver(votes_cast)
+def publish_votes(sender, poll_id, choice_ids, **kwargs):
+    get_broker().publish(poll_id, Counter(choice_ids))
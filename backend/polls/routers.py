@@ -0,0 +1,100 @@
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import receiver
+
+from .cache import get_poll_cache
+from .signals import polls_created, votes_cast
+
+_reading_from_replica = ContextVar("reading_from_replica", default=False)
+
+
+def _pin_key(user_id):
+    return f"primary_pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Serve the user's reads from the primary for the next few seconds."""
+    get_poll_cache().set(_pin_key(user_id), True, settings.POLLS_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and get_poll_cache().get(_pin_key(user.id), False)
+
+
+async def ais_pinned_to_primary(user):
+    return user.is_authenticated and await get_poll_cache().aget(
+        _pin_key(user.id), False
+    )
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads made inside ``read_from_replica`` views to a random
+    ``replica_*`` database; everything else, writes included, goes to the
+    primary (``default``).
+    """
+
+    def __init__(self):
+        self.replicas = [alias for alias in connections if alias.startswith("replica_")]
+
+    def db_for_read(self, model, **hints):
+        if self.replicas and _reading_from_replica.get():
+            return random.choice(self.replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+def read_from_replica(view):
+    """
+    Let a read-only view query the replicas, unless the requesting user wrote
+    recently and must keep reading their own writes from the primary.
+    """
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if await ais_pinned_to_primary(request.user):
+                return await view(request, *args, **kwargs)
+
+            token = _reading_from_replica.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _reading_from_replica.reset(token)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if is_pinned_to_primary(request.user):
+            return view(request, *args, **kwargs)
+
+        token = _reading_from_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _reading_from_replica.reset(token)
+
+    return wrapper
+
+
+@receiver(votes_cast)
+def pin_voter(sender, user_id, **kwargs):
+    pin_to_primary(user_id)
+
+
+@receiver(polls_created)
+def pin_poll_owners(sender, polls, **kwargs):
+    for user_id in {poll.user_id for poll in polls}:
+        pin_to_primary(user_id)
@@ -0,0 +1,243 @@
+"""
+Keyword search over poll questions and choices.
+
+A query is split into terms, and a poll matches when its question or
+choices hold every term as a word, the last term being allowed to only
+start one, as it may not be fully typed yet (unless it is a single
+letter). Results come in three groups, newest first within each: polls
+whose question holds every term as a whole word, then polls holding every
+term as a whole word anywhere, then those matched by the last term's
+prefix. A group is only searched once the previous ones ran out, and a
+query serves at most ``POLLS_SEARCH_MAX_RESULTS`` results, so that a term
+common to most polls costs no more than a rare one.
+
+``FTS5SearchBackend`` keeps an SQLite FTS5 table and is used whenever the
+database supports it. ``InvertedIndexSearchBackend`` keeps a ``SearchTerm``
+row per word and poll and works on any database. Either one is updated as
+polls are created; ``rebuild_search_index`` repopulates it.
+"""
+
+import re
+import unicodedata
+from functools import cache, reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Poll, SearchTerm
+from .signals import polls_created
+
+FTS5_TABLE = "polls_poll_search"
+
+# Longest query, in terms.
+MAX_QUERY_TERMS = 8
+
+WORD = re.compile(r"[^\W_]+")
+
+
+def search_terms(text):
+    """The lowercased words of ``text``, stripped of their diacritics."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return WORD.findall(text)
+
+
+def parse_query(query):
+    """The terms of a search query, or an empty list if it has none."""
+    return search_terms(query)[:MAX_QUERY_TERMS]
+
+
+def fts5_supported(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ("ENABLE_FTS5",) in cursor.fetchall()
+
+
+class FTS5SearchBackend:
+    """
+    Searches a contentless FTS5 table holding each poll's question and
+    choices under the poll's id, with prefix indexes for terms of up to four
+    letters. Whole words are read newest first straight from the index;
+    longer prefixes cost a read of every poll matching them.
+    """
+
+    def index(self, polls):
+        rows = [
+            (
+                poll.id,
+                poll.question,
+                " ".join(choice.choice_txt for choice in poll.choice_set.all()),
+            )
+            for poll in polls
+        ]
+        with connections[router.db_for_write(Poll)].cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS5_TABLE} (rowid, question, choices) "
+                "VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def clear(self):
+        with connections[router.db_for_write(Poll)].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS5_TABLE} ({FTS5_TABLE}) VALUES ('delete-all')"
+            )
+
+    def search(self, terms, offset, limit):
+        """Ids of the polls matching every term, best match first."""
+        stop = min(offset + limit, settings.POLLS_SEARCH_MAX_RESULTS)
+        words = self._expression(terms)
+        groups = [f"question : ({words})", f"({words}) NOT question : ({words})"]
+        if len(terms[-1]) > 1:
+            groups.append(f"({self._expression(terms, prefix=True)}) NOT ({words})")
+
+        poll_ids = []
+        with connections[router.db_for_read(Poll)].cursor() as cursor:
+            for expression in groups:
+                if len(poll_ids) >= stop:
+                    break
+                poll_ids += self._matches(cursor, expression, stop - len(poll_ids))
+        return poll_ids[offset:stop]
+
+    def filter(self, polls, terms):
+        """Narrow ``polls`` down to those matching every term."""
+        return polls.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS5_TABLE} WHERE {FTS5_TABLE} MATCH %s",
+                [self._expression(terms, prefix=True)],
+            )
+        )
+
+    def _matches(self, cursor, expression, limit):
+        cursor.execute(
+            f"SELECT rowid FROM {FTS5_TABLE} WHERE {FTS5_TABLE} MATCH %s "
+            "ORDER BY rowid DESC LIMIT %s",
+            [expression, limit],
+        )
+        return [poll_id for (poll_id,) in cursor.fetchall()]
+
+    def _expression(self, terms, prefix=False):
+        # Terms hold nothing but letters and digits: quoting them is enough.
+        expression = " ".join(f'"{term}"' for term in terms)
+        if prefix and len(terms[-1]) > 1:
+            expression += "*"
+        return expression
+
+
+class InvertedIndexSearchBackend:
+    """
+    Searches ``SearchTerm`` rows, looking the last term's prefix up as a
+    range of their (term, poll) index.
+    """
+
+    def index(self, polls):
+        SearchTerm.objects.bulk_create(
+            SearchTerm(poll_id=poll.id, term=term, in_question=in_question)
+            for poll in polls
+            for term, in_question in self._terms(poll).items()
+        )
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def search(self, terms, offset, limit):
+        stop = min(offset + limit, settings.POLLS_SEARCH_MAX_RESULTS)
+        matches = self._matches(terms).annotate(
+            group=Case(
+                When(words_in_question=len(terms), then=0),
+                When(words=len(terms), then=1),
+                default=2,
+            )
+        )
+        return list(
+            matches.order_by("group", "-poll_id").values_list("poll_id", flat=True)[
+                offset:stop
+            ]
+        )
+
+    def filter(self, polls, terms):
+        return polls.filter(id__in=self._matches(terms).values("poll_id"))
+
+    def _matches(self, terms):
+        words = [Q(term=term) for term in terms]
+        prefixes = words[:-1] + [self._prefix(terms[-1])]
+        return (
+            SearchTerm.objects.filter(reduce(or_, prefixes))
+            .values("poll_id")
+            .annotate(
+                matched=self._satisfied(prefixes),
+                words=self._satisfied(words),
+                words_in_question=self._satisfied(
+                    [word & Q(in_question=True) for word in words]
+                ),
+            )
+            .filter(matched=len(terms))
+        )
+
+    def _satisfied(self, conditions):
+        """How many of the conditions some word of the poll satisfies."""
+        return Count(
+            Case(
+                *(
+                    When(condition, then=Value(index))
+                    for index, condition in enumerate(conditions)
+                )
+            ),
+            distinct=True,
+        )
+
+    def _prefix(self, term):
+        if len(term) == 1:
+            return Q(term=term)
+        return Q(term__gte=term, term__lt=term + "\U0010ffff")
+
+    def _terms(self, poll):
+        """Whether each word of the poll appears in its question."""
+        max_length = SearchTerm._meta.get_field("term").max_length
+        terms = {}
+        for choice in poll.choice_set.all():
+            for term in search_terms(choice.choice_txt):
+                terms[term[:max_length]] = False
+        for term in search_terms(poll.question):
+            terms[term[:max_length]] = True
+        return terms
+
+
+@cache
+def get_search_backend():
+    if settings.POLLS_SEARCH_BACKEND:
+        return import_string(settings.POLLS_SEARCH_BACKEND)()
+    if fts5_supported(connection):
+        return FTS5SearchBackend()
+    return InvertedIndexSearchBackend()
+
+
+def index_polls(polls, batch_size=2000):
+    """
+    Add the polls of a queryset to the search index, a batch at a time.
+    Return how many were indexed.
+    """
+    backend = get_search_backend()
+    indexed = 0
+    batch = []
+    for poll in polls.prefetch_related("choice_set").iterator(chunk_size=batch_size):
+        batch.append(poll)
+        if len(batch) == batch_size:
+            backend.index(batch)
+            indexed += len(batch)
+            batch.clear()
+    backend.index(batch)
+    return indexed + len(batch)
+
+
+@receiver(polls_created)
+def index_created_polls(sender, polls, **kwargs):
+    # Created polls come with their choices already fetched.
+    get_search_backend().index(polls)
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# Sent once the transaction that recorded a ballot has committed.
+# Arguments: poll_id, user_id, choice_ids.
+votes_cast = Signal()
+
+# Sent once the transaction that created polls has committed.
+# Arguments: polls.
+polls_created = Signal()
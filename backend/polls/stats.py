@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, IntegerField, Min, Subquery
+from django.db.models.functions import Coalesce
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import get_poll_cache
+from .models import Poll, Vote
+from .signals import polls_created, votes_cast
+
+
+def _stats_key(user_id):
+    return f"user_stats:{user_id}"
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.annotate(total=Count("id")).values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _user_stats(user_id):
+    polls = Poll.objects.filter(user_id=user_id).order_by().values("user")
+    active_polls = polls.filter(deadline__gt=timezone.now())
+    votes = Vote.objects.filter(user_id=user_id).order_by().values("user")
+
+    return User.objects.filter(pk=user_id).values(
+        total_polls=_count(polls),
+        active_polls=_count(active_polls),
+        next_expiry=Subquery(
+            active_polls.annotate(earliest=Min("deadline")).values("earliest")
+        ),
+        total_votes=_count(votes),
+    )
+
+
+def compute_user_stats(user_id):
+    """
+    Count a user's polls and votes in a single query. ``next_expiry`` is the
+    earliest deadline among their active polls: the moment ``active_polls``
+    stops being accurate.
+    """
+    return _user_stats(user_id).get()
+
+
+def _is_stale(stats):
+    return stats is None or (
+        stats["next_expiry"] is not None and stats["next_expiry"] <= timezone.now()
+    )
+
+
+async def aget_user_stats(user_id):
+    """
+    Return the cached stats summary of a user, computing it on a miss or once
+    one of their active polls has expired since it was computed.
+    """
+    stats = await get_poll_cache().aget(_stats_key(user_id))
+    if _is_stale(stats):
+        stats = await _user_stats(user_id).aget()
+        await get_poll_cache().aset(
+            _stats_key(user_id), stats, settings.POLLS_USER_STATS_TIMEOUT
+        )
+    return stats
+
+
+def _update_user_stats(user_id, update):
+    stats = get_poll_cache().get(_stats_key(user_id))
+    if stats is not None:
+        update(stats)
+        get_poll_cache().set(
+            _stats_key(user_id), stats, settings.POLLS_USER_STATS_TIMEOUT
+        )
+
+
+@receiver(polls_created)
+def count_created_polls(sender, polls, **kwargs):
+    now = timezone.now()
+    for poll in polls:
+
+        def update(stats):
+            stats["total_polls"] += 1
+            if poll.deadline > now:
+                stats["active_polls"] += 1
+                if stats["next_expiry"] is None or poll.deadline < stats["next_expiry"]:
+                    stats["next_expiry"] = poll.deadline
+
+        _update_user_stats(poll.user_id, update)
+
+
+@receiver(votes_cast)
+def count_cast_votes(sender, user_id, choice_ids, **kwargs):
+    def update(stats):
+        stats["total_votes"] += len(choice_ids)
+
+    _update_user_stats(user_id, update)
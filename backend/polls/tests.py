@@ -1,3 +1,763 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import re
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from polls.api.polls.serializers import VoteSerializer
+from polls.api.polls.serializers.vote_serializer import VoteListSerializer
+from polls.authentication import CachedJWTAuthentication
+from polls.benchmarks.data import seed_dataset
+from polls.cache import cache_poll, get_cached_poll
+from polls.counters import DirectVoteCounter, ShardedVoteCounter
+from polls.histograms import compact_vote_buckets, count_ballot, vote_histogram
+from polls.idempotency import get_idempotency_cache
+from polls.metrics import request_metrics
+from polls.models import Choice, Poll, Vote, VoteBucket
+from polls.search import get_search_backend
+from polls.trending import TrendingRanking
+from polls.votelog import VoteLog
+
+# Scans of rows already narrowed down: a constant row, the rows of a
+# subquery, or those of an FTS5 full-text match.
+NARROWED_SCAN = re.compile(
+    r"SCAN (CONSTANT ROW|\(subquery-\d+\)|\w+ VIRTUAL TABLE INDEX \d+:M)"
+)
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked on SQLite.")
+class QueryPlanTests(TestCase):
+    """Hot read paths must be served by index lookups, never full table scans."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=50, polls=500, votes_per_poll=5)
+        cls.poll = Poll.objects.order_by("id").first()
+        cls.user = cls.poll.user
+
+    def setUp(self):
+        caches["polls"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def query_plans(self, path):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                if query["sql"].startswith("SELECT"):
+                    cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                    plans.append([row[-1] for row in cursor.fetchall()])
+        return plans
+
+    def assertNoFullScan(self, plans):
+        for plan in plans:
+            for step in plan:
+                if step.startswith("SCAN ") and not NARROWED_SCAN.match(step):
+                    self.assertIn(" USING ", step, f"Full table scan in {plan}")
+
+    def assertUsesIndex(self, plans, index_name):
+        self.assertTrue(
+            any(index_name in step for plan in plans for step in plan),
+            f"{index_name} not used by {plans}",
+        )
+
+    def test_get_polls(self):
+        plans = self.query_plans("/polls/api/polls/")
+        self.assertNoFullScan(plans)
+        self.assertUsesIndex(plans, "poll_created_at_id_idx")
+
+    def test_get_polls_filtered(self):
+        plans = self.query_plans(
+            f"/polls/api/polls/?status=active&owner={self.user.username}"
+        )
+        self.assertNoFullScan(plans)
+
+    def test_get_polls_popular(self):
+        plans = self.query_plans("/polls/api/polls/?sort=popular")
+        self.assertNoFullScan(plans)
+        self.assertUsesIndex(plans, "poll_total_votes_idx")
+
+    def test_search_polls(self):
+        plans = self.query_plans("/polls/api/polls/search/?q=seeded%20po")
+        self.assertNoFullScan(plans)
+
+    def test_get_poll(self):
+        self.assertNoFullScan(self.query_plans(f"/polls/api/polls/{self.poll.id}/"))
+
+    def test_get_vote_histogram(self):
+        plans = self.query_plans(f"/polls/api/polls/{self.poll.id}/histogram/")
+        self.assertNoFullScan(plans)
+        self.assertUsesIndex(plans, "vote_bucket_poll_idx")
+
+    def test_get_user_stats(self):
+        plans = self.query_plans("/polls/api/user_stats/")
+        self.assertNoFullScan(plans)
+        self.assertUsesIndex(plans, "poll_user_deadline_idx")
+
+
+class PollPaginationTests(TestCase):
+    """Cursors must page through polls tied on the sort order."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("tied-owner")
+        now = timezone.now()
+        Poll.objects.bulk_create(
+            Poll(
+                question=f"Tied poll #{i}?",
+                user=user,
+                created_at=now,
+                deadline=now + timedelta(days=1),
+            )
+            for i in range(1150)
+        )
+        cls.poll_ids = sorted(Poll.objects.values_list("id", flat=True), reverse=True)
+
+    def walk(self, url, link):
+        ids = []
+        while url is not None:
+            page = APIClient().get(url).json()
+            ids.extend(poll["id"] for poll in page["results"])
+            url = page[link]
+            self.assertLess(len(ids), 2 * len(self.poll_ids), "Pages repeat")
+        return ids
+
+    def test_walk_tied_polls(self):
+        for sort in ("popular", "newest"):
+            with self.subTest(sort=sort):
+                ids = self.walk(f"/polls/api/polls/?sort={sort}&page_size=100", "next")
+                self.assertEqual(ids, self.poll_ids)
+
+    def test_walk_back_tied_polls(self):
+        page = APIClient().get("/polls/api/polls/?sort=popular&page_size=100").json()
+        while page["next"] is not None:
+            last = page
+            page = APIClient().get(page["next"]).json()
+        ids = self.walk(page["previous"], "previous")
+        # Each page keeps its order, pages come last to first.
+        self.assertEqual(sorted(ids, reverse=True), self.poll_ids[:-50])
+        self.assertEqual(ids[:100], [poll["id"] for poll in last["results"]])
+
+
+class VoteHistogramTests(TestCase):
+    """Ballots are counted per minute and folded into hours and days."""
+
+    start = datetime(2026, 1, 1, 10, 15, 30, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("histogram-owner")
+        cls.poll = Poll.objects.create(
+            question="Charted?",
+            user=cls.owner,
+            allows_multiple_choices=True,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        cls.yes, cls.no = Choice.objects.bulk_create(
+            Choice(poll=cls.poll, choice_txt=text) for text in ("Yes", "No")
+        )
+
+    def cast(self, at, *choices):
+        with mock.patch("polls.histograms.timezone.now", return_value=at):
+            count_ballot(
+                sender=None,
+                poll_id=self.poll.id,
+                choice_ids=[choice.id for choice in choices],
+            )
+
+    def cast_spread(self):
+        self.cast(self.start, self.yes, self.no)
+        self.cast(self.start + timedelta(seconds=20), self.yes)
+        self.cast(self.start + timedelta(minutes=1), self.no)
+        self.cast(self.start + timedelta(hours=1), self.yes)
+        self.cast(self.start + timedelta(days=1), self.yes)
+
+    def at(self, **delta):
+        return self.start.replace(second=0) + timedelta(**delta)
+
+    def test_count_ballot(self):
+        self.cast_spread()
+        buckets = VoteBucket.objects.filter(poll=self.poll)
+        self.assertEqual(set(buckets.values_list("resolution", flat=True)), {"minute"})
+        self.assertEqual(sum(buckets.values_list("count", flat=True)), 6)
+        self.assertEqual(
+            buckets.get(choice=self.yes, start=self.at()).count, 2, "Same minute"
+        )
+
+    def test_vote_histogram(self):
+        self.cast_spread()
+        yes, no = self.yes.id, self.no.id
+        self.assertEqual(
+            vote_histogram(self.poll.id, "minute"),
+            [
+                (self.at(), {yes: 2, no: 1}),
+                (self.at(minutes=1), {no: 1}),
+                (self.at(hours=1), {yes: 1}),
+                (self.at(days=1), {yes: 1}),
+            ],
+        )
+        self.assertEqual(
+            vote_histogram(self.poll.id, "hour"),
+            [
+                (self.at(minutes=-15), {yes: 2, no: 2}),
+                (self.at(hours=1, minutes=-15), {yes: 1}),
+                (self.at(days=1, minutes=-15), {yes: 1}),
+            ],
+        )
+        midnight = self.start.replace(hour=0, minute=0, second=0)
+        self.assertEqual(
+            vote_histogram(self.poll.id, "day"),
+            [(midnight, {yes: 3, no: 2}), (midnight + timedelta(days=1), {yes: 1})],
+        )
+
+    def test_compaction(self):
+        for day in range(40):
+            self.cast(self.start + timedelta(days=day), self.yes)
+            self.cast(self.start + timedelta(days=day, minutes=5), self.no)
+        before = vote_histogram(self.poll.id, "day")
+        now = self.start + timedelta(days=40)
+
+        self.assertEqual(compact_vote_buckets(now), 80 - 2 + 2 * 10)
+        self.assertEqual(compact_vote_buckets(now), 0)
+
+        buckets = VoteBucket.objects.filter(poll=self.poll)
+        # Minutes are kept for a day, hours for 30 days: the first 10 days
+        # are left as a day bucket per choice.
+        self.assertEqual(buckets.filter(resolution="minute").count(), 2)
+        self.assertEqual(buckets.filter(resolution="hour").count(), 2 * 29)
+        self.assertEqual(buckets.filter(resolution="day").count(), 2 * 10)
+        self.assertEqual(sum(buckets.values_list("count", flat=True)), 80)
+        self.assertEqual(vote_histogram(self.poll.id, "day"), before)
+
+    def test_get_vote_histogram(self):
+        self.cast_spread()
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        url = f"/polls/api/polls/{self.poll.id}/histogram/"
+
+        response = client.get(url, {"resolution": "day"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["resolution"], "day")
+        self.assertEqual(
+            [bucket["counts"] for bucket in response.json()["buckets"]],
+            [{str(self.yes.id): 3, str(self.no.id): 2}, {str(self.yes.id): 1}],
+        )
+        self.assertEqual(client.get(url, {"resolution": "week"}).status_code, 400)
+        self.assertEqual(client.get("/polls/api/polls/0/histogram/").status_code, 404)
+
+        client.force_authenticate(User.objects.create_user("someone-else"))
+        self.assertEqual(client.get(url).status_code, 403)
+
+
+@override_settings(POLLS_EXPORT_CHUNK_SIZE=2)
+class VoteExportTests(TestCase):
+    """Exports are streamed a chunk of rows at a time, under WSGI and ASGI."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("export-owner")
+        cls.poll = Poll.objects.create(
+            question="Exported?",
+            user=cls.owner,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        choice = Choice.objects.create(poll=cls.poll, choice_txt="Yes")
+        Vote.objects.bulk_create(
+            Vote(
+                user=User.objects.create_user(f"exporter-{i}"),
+                poll=cls.poll,
+                choice=choice,
+            )
+            for i in range(5)
+        )
+        cls.url = f"/polls/api/polls/{cls.poll.id}/export/"
+
+    def test_export_under_wsgi(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        # The header and a row, then two rows per chunk.
+        self.assertEqual([chunk.count("\n") for chunk in chunks], [2, 2, 2])
+        self.assertTrue(chunks[0].startswith("id,voter,choice,choiceTxt,createdAt"))
+
+    async def test_export_under_asgi(self):
+        token = AccessToken.for_user(self.owner)
+        response = await AsyncClient().get(
+            self.url,
+            {"output": "ndjson"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        # An async iterator, which the server reads as it goes rather than
+        # collecting it into a list first.
+        self.assertTrue(response.is_async)
+        chunks = aiter(response.streaming_content)
+        for expected_rows in (2, 2, 1):
+            chunk = (await anext(chunks)).decode()
+            self.assertEqual(chunk.count("\n"), expected_rows)
+            self.assertEqual(json.loads(chunk.splitlines()[0])["choiceTxt"], "Yes")
+        with self.assertRaises(StopAsyncIteration):
+            await anext(chunks)
+
+
+class VoteTotalsTests(TestCase):
+    """Poll totals are kept by the vote counter, new voters counted once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voter = User.objects.create_user("totals-voter")
+        cls.poll = Poll.objects.create(
+            question="Totalled?",
+            user=User.objects.create_user("totals-owner"),
+            allows_multiple_choices=True,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        cls.choices = Choice.objects.bulk_create(
+            Choice(poll=cls.poll, choice_txt=text) for text in ("A", "B", "C")
+        )
+
+    def ballot(self, *choices):
+        request = mock.Mock(user=self.voter)
+        serializer = VoteSerializer(
+            data=[{"poll": self.poll.id, "choice": choice.id} for choice in choices],
+            many=True,
+            context={"request": request},
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer
+
+    def assertTotals(self, total_votes, unique_voters):
+        self.poll.refresh_from_db()
+        self.assertEqual(
+            (self.poll.total_votes, self.poll.unique_voters),
+            (total_votes, unique_voters),
+        )
+
+    def test_concurrent_first_ballots(self):
+        for counter in (DirectVoteCounter(), ShardedVoteCounter(shards=1)):
+            with self.subTest(counter=type(counter).__name__):
+                Vote.objects.all().delete()
+                Poll.objects.filter(id=self.poll.id).update(
+                    total_votes=0, unique_voters=0
+                )
+                with mock.patch(
+                    "polls.api.polls.serializers.vote_serializer.get_vote_counter",
+                    return_value=counter,
+                ):
+                    # Both validated before either is recorded: both look
+                    # like the user's first ballot.
+                    first, second = self.ballot(self.choices[0]), self.ballot(
+                        self.choices[1], self.choices[2]
+                    )
+                    first.save()
+                    second.save()
+                counter.flush()
+                self.assertTotals(3, 1)
+                self.assertEqual(
+                    Vote.objects.filter(poll=self.poll, first_ballot=True).count(), 1
+                )
+
+
+class SingleChoiceVoteTests(TestCase):
+    """A user votes once on a single-choice poll, however the race goes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voter = User.objects.create_user("single-voter")
+        owner = User.objects.create_user("single-owner")
+        deadline = timezone.now() + timedelta(days=1)
+        cls.single = Poll.objects.create(question="One?", user=owner, deadline=deadline)
+        cls.multiple = Poll.objects.create(
+            question="Several?",
+            user=owner,
+            allows_multiple_choices=True,
+            deadline=deadline,
+        )
+        cls.single_choices = Choice.objects.bulk_create(
+            Choice(poll=cls.single, choice_txt=text) for text in ("A", "B")
+        )
+        cls.multiple_choices = Choice.objects.bulk_create(
+            Choice(poll=cls.multiple, choice_txt=text) for text in ("A", "B", "C")
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.voter)
+
+    def vote(self, *choices):
+        return self.client.post(
+            "/polls/api/polls/vote/",
+            [{"poll": choice.poll_id, "choice": choice.id} for choice in choices],
+            format="json",
+        )
+
+    def assertAlreadyVoted(self, response):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"nonFieldErrors": ["You have already voted on this poll!"]},
+        )
+
+    def test_duplicate_ballot(self):
+        self.assertEqual(self.vote(self.single_choices[0]).status_code, 201)
+        self.assertAlreadyVoted(self.vote(self.single_choices[1]))
+        self.assertEqual(Vote.objects.filter(poll=self.single).count(), 1)
+
+    def test_concurrent_duplicate_ballot(self):
+        request = mock.Mock(user=self.voter)
+        concurrent = VoteSerializer(
+            data=[{"poll": self.single.id, "choice": self.single_choices[0].id}],
+            many=True,
+            context={"request": request},
+        )
+        self.assertTrue(concurrent.is_valid(), concurrent.errors)
+        validate = VoteListSerializer.validate
+
+        def validate_then_race(serializer, attrs):
+            attrs = validate(serializer, attrs)
+            concurrent.save()
+            return attrs
+
+        # The concurrent ballot is recorded once this one passed validation:
+        # only the unique constraint on single-choice votes stops it.
+        with mock.patch.object(VoteListSerializer, "validate", validate_then_race):
+            self.assertAlreadyVoted(self.vote(self.single_choices[1]))
+        self.assertEqual(
+            list(
+                Vote.objects.filter(poll=self.single).values_list("choice", flat=True)
+            ),
+            [self.single_choices[0].id],
+        )
+
+    def test_multiple_choices(self):
+        first, second, third = self.multiple_choices
+        self.assertEqual(self.vote(first, second).status_code, 201)
+        self.assertEqual(self.vote(third).status_code, 201)
+        self.assertEqual(Vote.objects.filter(poll=self.multiple).count(), 3)
+
+
+class IdempotencyTests(TestCase):
+    """Retries carrying an Idempotency-Key get the original response."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("idempotent-user")
+        cls.deadline = (timezone.now() + timedelta(days=1)).isoformat()
+
+    def setUp(self):
+        get_idempotency_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, question, key="retried"):
+        return self.client.post(
+            "/polls/api/polls/create/",
+            {
+                "question": question,
+                "deadline": self.deadline,
+                "choiceSet": [{"choiceTxt": "Yes"}, {"choiceTxt": "No"}],
+            },
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_replay(self):
+        original = self.create("Once?")
+        self.assertEqual(original.status_code, 201)
+        replayed = self.create("Once?")
+        self.assertEqual(replayed.status_code, 201)
+        self.assertEqual(replayed.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(replayed.json(), original.json())
+        self.assertEqual(Poll.objects.filter(question="Once?").count(), 1)
+
+    def test_replay_vote(self):
+        poll = Poll.objects.create(
+            question="Voted once?", user=self.user, deadline=self.deadline
+        )
+        choice = Choice.objects.create(poll=poll, choice_txt="Yes")
+        for expected in (None, "true"):
+            response = self.client.post(
+                "/polls/api/polls/vote/",
+                [{"poll": poll.id, "choice": choice.id}],
+                format="json",
+                headers={"Idempotency-Key": "ballot"},
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.headers.get("Idempotent-Replayed"), expected)
+        self.assertEqual(Vote.objects.filter(poll=poll).count(), 1)
+
+    def test_in_flight(self):
+        digest = hashlib.sha256(b"retried").hexdigest()
+        # Claimed by a first attempt that has not responded yet.
+        get_idempotency_cache().add(
+            f"idempotency:{self.user.pk}:{digest}", ("pending", "first attempt")
+        )
+        response = self.create("Running?")
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Poll.objects.filter(question="Running?").exists())
+
+    def test_different_request(self):
+        self.assertEqual(self.create("First?").status_code, 201)
+        response = self.create("Second?")
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Poll.objects.filter(question="Second?").exists())
+        self.assertEqual(self.create("Second?", key="other").status_code, 201)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Users are served from cache, without their password hash."""
+
+    def setUp(self):
+        caches["polls"].clear()
+        self.user = User.objects.create_user("cached-user", password="secret")
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def assertCachedUser(self, user):
+        self.assertEqual(
+            (user.pk, user.username, user.date_joined),
+            (self.user.pk, self.user.username, self.user.date_joined),
+        )
+        self.assertEqual(user.get_deferred_fields(), {"password"})
+
+    def test_cached_fields(self):
+        self.authentication.get_user(self.token)
+        entry = caches["polls"].get(f"auth_user_fields:{self.user.pk}")
+        self.assertNotIn(self.user.password, entry)
+
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+        self.assertCachedUser(user)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("secret"))
+
+    async def test_cached_fields_async(self):
+        await sync_to_async(self.authentication.get_user)(self.token)
+        self.assertCachedUser(await self.authentication.aget_user(self.token))
+
+    def test_saved_user_forgotten(self):
+        self.authentication.get_user(self.token)
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertEqual(self.authentication.get_user(self.token).first_name, "Renamed")
+
+
+class PollCreateTests(TestCase):
+    """Created polls are returned and indexed without querying them again."""
+
+    def test_bulk_create_queries(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("bulk-creator"))
+        deadline = (timezone.now() + timedelta(days=1)).isoformat()
+        polls = [
+            {
+                "question": f"Bulk poll {i}?",
+                "deadline": deadline,
+                "choiceSet": [{"choiceTxt": "Yes"}, {"choiceTxt": "No"}],
+            }
+            for i in range(3)
+        ]
+        get_search_backend()  # Picked once per process.
+        # The polls, then their choices, inside a savepoint; indexing them
+        # once committed. Nothing is read back.
+        with self.assertNumQueries(5), self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                "/polls/api/polls/bulk_create/", polls, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [
+                [choice["choiceTxt"] for choice in poll["choiceSet"]]
+                for poll in response.json()
+            ],
+            [["Yes", "No"]] * 3,
+        )
+
+
+@override_settings(POLLS_CACHE_ACTIVE_TIMEOUT=60)
+class PollCacheTests(TestCase):
+    """Polls are cached for good only once their results are final."""
+
+    def cache_timeout(self, **fields):
+        poll = Poll(id=1, question="Cached?", **fields)
+        with mock.patch.object(caches["polls"], "set") as cache_set:
+            cache_poll(poll, {"question": poll.question})
+        return cache_set.call_args.args[2]
+
+    def test_active(self):
+        timeout = self.cache_timeout(deadline=timezone.now() + timedelta(seconds=30))
+        self.assertTrue(0 < timeout <= 30)
+        timeout = self.cache_timeout(deadline=timezone.now() + timedelta(days=1))
+        self.assertEqual(timeout, 60)
+
+    def test_past_deadline_not_finalized(self):
+        timeout = self.cache_timeout(deadline=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(timeout, 60)
+
+    def test_finalized(self):
+        timeout = self.cache_timeout(
+            deadline=timezone.now() - timedelta(seconds=1),
+            status=Poll.Status.EXPIRED,
+        )
+        self.assertIsNone(timeout)
+
+
+class TrendingPollsTests(TestCase):
+    """Trending polls are read from the ranking a page at a time."""
+
+    def setUp(self):
+        owner = User.objects.create_user("trending-owner")
+        deadline = timezone.now() + timedelta(days=1)
+        self.polls = [
+            Poll.objects.create(
+                question=f"Trending {i}?", user=owner, deadline=deadline
+            )
+            for i in range(5)
+        ]
+        Poll.objects.filter(id=self.polls[-1].id).update(status=Poll.Status.EXPIRED)
+        with mock.patch("atexit.register") as register:
+            self.ranking = TrendingRanking(3600, 10, sync_interval=None)
+        register.assert_not_called()
+        for i, poll in enumerate(self.polls):
+            for _ in range(i + 1):
+                self.ranking.record(poll.id)
+
+    def test_pages_through_ranking(self):
+        with mock.patch(
+            "polls.api.polls.views.trending.get_trending_ranking",
+            return_value=self.ranking,
+        ), mock.patch.object(self.ranking, "top", wraps=self.ranking.top) as top:
+            response = APIClient().get("/polls/api/polls/trending/?limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [poll["id"] for poll in response.json()],
+            [self.polls[3].id, self.polls[2].id],
+            "The ended poll is skipped",
+        )
+        self.assertEqual(top.call_args_list, [mock.call(2, 0), mock.call(2, 2)])
+
+
+class VoteLogRebuildTests(TestCase):
+    """Only polls whose votes were all logged are rebuilt from the log."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        log_dir = override_settings(POLLS_VOTE_LOG_DIR=directory.name)
+        log_dir.enable()
+        self.addCleanup(log_dir.disable)
+        self.log = VoteLog(directory.name, 1 << 20)
+
+        owner = User.objects.create_user("log-owner")
+        self.voters = [User.objects.create_user(f"log-voter-{i}") for i in range(2)]
+        deadline = timezone.now() + timedelta(days=1)
+        # Voted on before the log started, and since.
+        self.older = Poll.objects.create(
+            question="Older?", user=owner, deadline=deadline
+        )
+        self.newer = Poll.objects.create(
+            question="Newer?",
+            user=owner,
+            deadline=deadline,
+            total_votes=5,
+            unique_voters=5,
+        )
+        self.older_choice = Choice.objects.create(
+            poll=self.older, choice_txt="Yes", vote_count=1
+        )
+        self.newer_choice = Choice.objects.create(
+            poll=self.newer, choice_txt="Yes", vote_count=5
+        )
+        Vote.objects.create(
+            user=self.voters[0],
+            poll=self.older,
+            choice=self.older_choice,
+            created_at=timezone.now() - timedelta(days=1),
+        )
+        logged_at = int(timezone.now().timestamp() * 1e6)
+        for voter in self.voters:
+            Vote.objects.create(user=voter, poll=self.newer, choice=self.newer_choice)
+        self.log.append(
+            (logged_at, self.newer.id, self.newer_choice.id, voter.id)
+            for voter in self.voters
+        )
+        self.log.close()
+
+    def rebuild(self, *args):
+        output = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("vote_log", "rebuild", *args, stdout=output)
+        return output.getvalue()
+
+    def test_dry_run(self):
+        output = self.rebuild("--dry-run")
+        self.assertIn(
+            f"Choice {self.newer_choice.id} of poll {self.newer.id}: 5 -> 2", output
+        )
+        self.newer_choice.refresh_from_db()
+        self.assertEqual(self.newer_choice.vote_count, 5)
+
+    def test_rebuild(self):
+        cache_poll(self.newer, {"question": "Newer?"})
+        self.rebuild()
+
+        self.older_choice.refresh_from_db()
+        self.newer_choice.refresh_from_db()
+        self.newer.refresh_from_db()
+        self.assertEqual(self.older_choice.vote_count, 1, "Not covered by the log")
+        self.assertEqual(self.newer_choice.vote_count, 2)
+        self.assertEqual((self.newer.total_votes, self.newer.unique_voters), (2, 2))
+        self.assertIsNone(get_cached_poll(self.newer.id))
+
+
+@override_settings(POLLS_METRICS_SAMPLE_RATE=1.0)
+class InstrumentationTests(TestCase):
+    """Queries are counted and timed under WSGI and ASGI alike."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.poll = Poll.objects.create(
+            question="Timed?",
+            user=User.objects.create_user("timed-owner"),
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        Choice.objects.create(poll=cls.poll, choice_txt="Yes")
+        cls.url = f"/polls/api/polls/{cls.poll.id}/"
+
+    def setUp(self):
+        caches["polls"].clear()
+        request_metrics.reset()
+
+    def assertQueriesTimed(self, response):
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers["Server-Timing"]
+        queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)[1])
+        self.assertGreater(queries, 0, timing)
+        histograms = request_metrics.snapshot()["get_poll"]
+        self.assertGreater(histograms["queries"]["sum"], 0)
+
+    def test_wsgi(self):
+        self.assertQueriesTimed(APIClient().get(self.url))
+
+    async def test_asgi(self):
+        self.assertQueriesTimed(await AsyncClient().get(self.url))
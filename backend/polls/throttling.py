@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .cache import get_poll_cache
+
+
+class InMemoryBucketStore:
+    """
+    Token buckets in process memory: exact, but per process. Holds at most
+    ``max_buckets``; the least recently used are forgotten first, which
+    only ever refills a bucket early.
+    """
+
+    def __init__(self, max_buckets=100_000):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, capacity, refill_rate):
+        """
+        Take a token from the bucket ``key``, holding up to ``capacity`` tokens
+        and gaining ``refill_rate`` per second. Return 0 if one was taken,
+        otherwise the number of seconds until one will be available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens, wait = _take(tokens, now - updated_at, capacity, refill_rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class CacheBucketStore:
+    """
+    Token buckets in the polls cache, shared by every process using it.
+    Reading and writing a bucket is not atomic, so concurrent requests may
+    occasionally both get its last token.
+    """
+
+    def take(self, key, capacity, refill_rate):
+        now = time.time()
+        cache_key = f"throttle:{key}"
+        tokens, updated_at = get_poll_cache().get(cache_key, (capacity, now))
+        tokens, wait = _take(tokens, now - updated_at, capacity, refill_rate)
+        # A bucket left alone until it is full again is as good as new.
+        timeout = (capacity - tokens) / refill_rate + 1
+        get_poll_cache().set(cache_key, (tokens, now), timeout)
+        return wait
+
+
+def _parse_rate(rate):
+    # Same "number/period" format as DRF's SimpleRateThrottle.
+    num, period = rate.split("/")
+    return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+
+def _take(tokens, elapsed, capacity, refill_rate):
+    tokens = min(capacity, tokens + elapsed * refill_rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / refill_rate
+
+
+@cache
+def get_bucket_store():
+    store_class = import_string(settings.POLLS_THROTTLE_STORE)
+    return store_class(**settings.POLLS_THROTTLE_STORE_OPTIONS)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle taking a token from one or more buckets per request, each with
+    the rate of its scope in ``DEFAULT_THROTTLE_RATES``: ``"20/min"`` allows
+    bursts of 20 requests, then one every 3 seconds. Buckets are tried in
+    order and a request turned down by one does not drain the next.
+    """
+
+    def get_buckets(self, request, view):
+        """``(scope, ident)`` pairs of the buckets the request draws from."""
+        raise NotImplementedError(".get_buckets() must be overridden")
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        for scope, ident in self.get_buckets(request, view):
+            # Read at request time, so that overriding the setting applies.
+            rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+            if ident is None or rate is None:
+                continue
+
+            capacity, duration = _parse_rate(rate)
+            wait = get_bucket_store().take(
+                f"{scope}:{ident}", capacity, capacity / duration
+            )
+            if wait:
+                self.wait_time = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class VoteRateThrottle(TokenBucketThrottle):
+    """Limits how fast a user votes, then how fast a single poll gets votes."""
+
+    def get_buckets(self, request, view):
+        # Ballots spanning several polls are rejected by validation anyway.
+        try:
+            poll_id = int(request.data[0]["poll"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            poll_id = None
+        return [("vote_user", request.user.pk), ("vote_poll", poll_id)]
+
+
+class SignupRateThrottle(TokenBucketThrottle):
+    def get_buckets(self, request, view):
+        return [("signup", self.get_ident(request))]
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    def get_buckets(self, request, view):
+        return [("login", self.get_ident(request))]
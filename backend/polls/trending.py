@@ -0,0 +1,300 @@
+"""
+Trending polls: polls ranked by how many ballots they received recently,
+each ballot's weight halving every ``POLLS_TRENDING_HALF_LIFE`` seconds.
+
+Scores use forward decay. A ballot cast at time ``t`` adds ``2 ** score_at(t)``
+to its poll's score, where ``score_at`` counts half-lives since ``EPOCH``,
+and scores are kept as base 2 logarithms so they never overflow. Every
+score decays at the same rate, so a ranking stays valid as time passes and a
+ballot only needs to move its own poll. ``decayed_votes`` converts a score
+back to a number of ballots as of now.
+
+Each process ranks the ``POLLS_TRENDING_SIZE`` best polls it knows of in a
+skip list, updated as ballots are cast. Every ``POLLS_TRENDING_SYNC_INTERVAL``
+seconds, a background thread adds the ballots it recorded to
+``Poll.trending_score`` and reloads its ranking from there, picking up the
+ballots other processes recorded in the meantime. Requests never wait for
+a sync, and syncs always go to the primary database. Ballots recorded after
+the last sync are persisted when a serving process exits.
+"""
+
+import atexit
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import cache
+from itertools import islice
+
+from django.conf import settings
+from django.db import router, transaction
+from django.dispatch import receiver
+
+from .models import Poll
+from .periodic import PeriodicTask
+from .signals import votes_cast
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc).timestamp()
+
+# Persisted scores worth less than this many half-lives of decay on a single
+# ballot (under a billionth of a fresh one) are dropped.
+FORGET_AFTER = 30
+
+PERSIST_BATCH_SIZE = 1000
+
+
+def score_at(at, half_life):
+    """The score of a single ballot cast at ``at`` (a POSIX timestamp)."""
+    return (at - EPOCH) / half_life
+
+
+def log_add(a, b):
+    """``log2(2 ** a + 2 ** b)``, with ``None`` standing for no ballot at all."""
+    if a is None:
+        return b
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log2(1 + 2.0 ** (low - high))
+
+
+def decayed_votes(score, half_life, now=None):
+    """The number of ballots a score is worth at ``now``, once decayed."""
+    return 2.0 ** (score - score_at(time.time() if now is None else now, half_life))
+
+
+class _Node:
+    __slots__ = ("key", "forward", "backward")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.forward = [None] * level
+        self.backward = None
+
+
+class SkipList:
+    """
+    Keys in ascending order, with O(log n) expected insertion and removal,
+    the smallest key in O(1) and iteration from the largest key down.
+    """
+
+    max_level = 32
+
+    def __init__(self, seed=None):
+        self._head = _Node(None, self.max_level)
+        self._tail = None
+        self._level = 1
+        self._len = 0
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self._len
+
+    def __reversed__(self):
+        node = self._tail
+        while node is not None:
+            yield node.key
+            node = node.backward
+
+    def first(self):
+        node = self._head.forward[0]
+        return None if node is None else node.key
+
+    def _predecessors(self, key):
+        update = [self._head] * self.max_level
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.forward[level] is not None and node.forward[level].key < key:
+                node = node.forward[level]
+            update[level] = node
+        return update
+
+    def insert(self, key):
+        update = self._predecessors(key)
+        level = 1
+        while level < self.max_level and self._random.random() < 0.5:
+            level += 1
+        self._level = max(self._level, level)
+
+        node = _Node(key, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+        node.backward = None if update[0] is self._head else update[0]
+        if node.forward[0] is None:
+            self._tail = node
+        else:
+            node.forward[0].backward = node
+        self._len += 1
+
+    def remove(self, key):
+        """Remove ``key``; return whether it was present."""
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if node is None or node.key != key:
+            return False
+
+        for i in range(len(node.forward)):
+            update[i].forward[i] = node.forward[i]
+        if node.forward[0] is None:
+            self._tail = node.backward
+        else:
+            node.forward[0].backward = node.backward
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._len -= 1
+        return True
+
+    def pop_first(self):
+        key = self.first()
+        if key is not None:
+            self.remove(key)
+        return key
+
+
+class TrendingRanking:
+    def __init__(self, half_life, size, sync_interval):
+        """Without a ``sync_interval``, syncs only happen when asked for."""
+        self.half_life = half_life
+        self.size = size
+        self._lock = threading.Lock()
+        # (score, poll_id) of the best ``size`` polls known to this process.
+        self._ranking = SkipList()
+        # Scores of the ranked polls and of those voted on since the last sync.
+        self._scores = {}
+        # Scores of the ballots recorded since the last sync.
+        self._pending = {}
+        self._loaded = False
+        self._syncer = (
+            None if sync_interval is None else PeriodicTask(self.sync, sync_interval)
+        )
+
+    def record(self, poll_id, at=None):
+        """Count a ballot cast on ``poll_id`` at ``at`` (now by default)."""
+        self._start()
+        score = score_at(time.time() if at is None else at, self.half_life)
+        with self._lock:
+            self._pending[poll_id] = log_add(self._pending.get(poll_id), score)
+            self._rank(poll_id, log_add(self._scores.get(poll_id), score))
+
+    def top(self, count=None, start=0):
+        """
+        ``(poll_id, score)`` of the ``count`` best ranked polls (all of them by
+        default) after the first ``start``, best first.
+        """
+        self._start()
+        if not self._loaded:
+            # A single indexed read: persisting is left to the syncs.
+            self.reload()
+        with self._lock:
+            stop = None if count is None else start + count
+            ranked = islice(reversed(self._ranking), start, stop)
+            return [(poll_id, score) for score, poll_id in ranked]
+
+    def sync(self):
+        """Persist the ballots recorded so far, then reload the ranking."""
+        self.persist()
+        self.reload()
+
+    def reload(self):
+        """Rank the best polls of ``Poll.trending_score`` afresh."""
+        ranked = (
+            Poll.objects.using(router.db_for_write(Poll))
+            .filter(trending_score__isnull=False)
+            .order_by("-trending_score")
+            .values_list("id", "trending_score")[: self.size]
+        )
+        scores = dict(ranked)
+
+        with self._lock:
+            # Ballots recorded while persisting are not in the database yet.
+            for poll_id, score in self._pending.items():
+                scores[poll_id] = log_add(scores.get(poll_id), score)
+            self._ranking, self._scores = SkipList(), {}
+            for poll_id, score in scores.items():
+                self._rank(poll_id, score)
+            self._loaded = True
+
+    def persist(self):
+        """Add the ballots recorded since the last call to ``Poll.trending_score``."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        # On the primary, whichever database the calling thread reads from.
+        db = router.db_for_write(Poll)
+        poll_ids = sorted(pending)
+        try:
+            for start in range(0, len(poll_ids), PERSIST_BATCH_SIZE):
+                batch = poll_ids[start : start + PERSIST_BATCH_SIZE]
+                with transaction.atomic(using=db):
+                    # Locked in id order, so that processes never deadlock.
+                    polls = list(
+                        Poll.objects.using(db)
+                        .select_for_update()
+                        .filter(id__in=batch, status=Poll.Status.ACTIVE)
+                        .order_by("id")
+                        .only("id", "trending_score")
+                    )
+                    for poll in polls:
+                        poll.trending_score = log_add(
+                            poll.trending_score, pending[poll.id]
+                        )
+                    Poll.objects.using(db).bulk_update(polls, ["trending_score"])
+                # Ballots on polls that ended or were deleted are dropped.
+                for poll_id in batch:
+                    del pending[poll_id]
+        except Exception:
+            with self._lock:
+                for poll_id, score in pending.items():
+                    self._pending[poll_id] = log_add(self._pending.get(poll_id), score)
+            raise
+
+        forgotten = score_at(time.time(), self.half_life) - FORGET_AFTER
+        Poll.objects.using(db).filter(trending_score__lt=forgotten).update(
+            trending_score=None
+        )
+
+    def _rank(self, poll_id, score):
+        # Scores only ever grow, so a poll pushed out of the ranking has a
+        # lower score than any poll still in it.
+        previous = self._scores.get(poll_id)
+        self._scores[poll_id] = score
+        if previous is not None and self._ranking.remove((previous, poll_id)):
+            self._ranking.insert((score, poll_id))
+        elif len(self._ranking) < self.size:
+            self._ranking.insert((score, poll_id))
+        elif (score, poll_id) > self._ranking.first():
+            self._ranking.pop_first()
+            self._ranking.insert((score, poll_id))
+
+    def _start(self):
+        if self._syncer is not None:
+            self._syncer.start()
+
+
+@cache
+def get_trending_ranking():
+    return TrendingRanking(
+        settings.POLLS_TRENDING_HALF_LIFE,
+        settings.POLLS_TRENDING_SIZE,
+        settings.POLLS_TRENDING_SYNC_INTERVAL,
+    )
+
+
+def persist_at_exit():
+    """
+    Persist the ballots this process recorded since its last sync when it
+    exits. Called by the WSGI and ASGI entry points only: test and benchmark
+    runs exit after their databases are gone.
+    """
+    ranking = get_trending_ranking()
+
+    def persist():
+        if ranking._pending:
+            ranking.persist()
+
+    atexit.register(persist)
+
+
+@receiver(votes_cast)
+def record_ballot(sender, poll_id, **kwargs):
+    get_trending_ranking().record(poll_id)
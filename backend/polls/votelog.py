@@ -0,0 +1,316 @@
+"""
+Append-only log of the votes cast, kept as segment files next to the database.
+
+A segment starts with ``MAGIC`` and is followed by fixed-width little-endian
+records (``RECORD``): when the vote was logged in microseconds since the
+epoch, then the poll, choice and user ids. Each process appends to its own
+``.open`` segment and renames it to ``.log`` once it reaches
+``POLLS_VOTE_LOG_SEGMENT_SIZE`` bytes, so writers never share a file and
+sealed segments are never written to again. A record whose write was cut
+short is ignored when reading.
+
+Records are appended once the vote transaction has committed, without
+fsync: the ``Vote`` table stays the source of truth, and ``vote_log verify``
+reports any vote the log missed.
+
+Compaction writes its merged segments as ``.tmp`` files, then a
+``MANIFEST`` naming them and the sealed segments they replace, and only
+then swaps them in. Readers finding a manifest read its outputs instead of
+its inputs, so a compaction cut short never has a record counted twice,
+and the next one finishes it.
+"""
+
+import atexit
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from .signals import votes_cast
+
+MAGIC = b"VOTELOG1"
+RECORD = struct.Struct("<qqqq")
+
+COLUMNAR_MAGIC = b"POLLCOL1"
+
+MANIFEST = "compaction.json"
+
+
+class VoteLog:
+    def __init__(self, directory, segment_size):
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._file = None
+        self._counter = itertools.count()
+
+    def append(self, records):
+        """Append ``(logged_at, poll_id, choice_id, user_id)`` records."""
+        data = b"".join(RECORD.pack(*record) for record in records)
+        with self._lock:
+            if self._file is None:
+                self._file = self._new_segment()
+            # A single write per ballot, so its records land together.
+            self._file.write(data)
+            self._file.flush()
+            if self._file.tell() >= self.segment_size:
+                self._seal()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._seal()
+
+    def _new_segment(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"votes-{time.time_ns()}-{os.getpid()}-{next(self._counter)}.open"
+        segment = open(self.directory / name, "xb", buffering=0)
+        segment.write(MAGIC)
+        return segment
+
+    def _seal(self):
+        path = Path(self._file.name)
+        self._file.close()
+        self._file = None
+        path.rename(path.with_suffix(".log"))
+
+
+@cache
+def get_vote_log():
+    """The process's ``VoteLog``, or ``None`` if ``POLLS_VOTE_LOG_DIR`` is unset."""
+    if not settings.POLLS_VOTE_LOG_DIR:
+        return None
+    vote_log = VoteLog(
+        settings.POLLS_VOTE_LOG_DIR, settings.POLLS_VOTE_LOG_SEGMENT_SIZE
+    )
+    atexit.register(vote_log.close)
+    return vote_log
+
+
+@receiver(votes_cast)
+def log_votes(sender, poll_id, user_id, choice_ids, **kwargs):
+    vote_log = get_vote_log()
+    if vote_log is not None:
+        logged_at = time.time_ns() // 1000
+        vote_log.append(
+            (logged_at, poll_id, choice_id, user_id) for choice_id in choice_ids
+        )
+
+
+def segments(directory, sealed_only=False):
+    """Segment files in ``directory``, oldest first."""
+    directory = Path(directory)
+    patterns = ["votes-*.log"] if sealed_only else ["votes-*.log", "votes-*.open"]
+    found = [path for pattern in patterns for path in directory.glob(pattern)]
+    manifest = _read_manifest(directory)
+    if manifest is not None:
+        # An unfinished compaction: its outputs stand for its inputs.
+        inputs = set(manifest["inputs"])
+        found = [path for path in found if path.name not in inputs]
+        found += [
+            directory / name
+            for name in manifest["outputs"]
+            if (directory / name).exists()
+        ]
+    return sorted(found, key=lambda path: int(path.name.split("-")[1]))
+
+
+def read_segment(path):
+    """
+    Iterate over the records of a segment through a read-only memory map,
+    so that memory use does not depend on the segment's size.
+    """
+    with open(path, "rb") as segment:
+        size = os.fstat(segment.fileno()).st_size
+        if size <= len(MAGIC):
+            return
+        with mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a vote log segment.")
+            end = len(MAGIC) + (size - len(MAGIC)) // RECORD.size * RECORD.size
+            view = memoryview(mapped)[len(MAGIC) : end]
+            try:
+                yield from RECORD.iter_unpack(view)
+            finally:
+                # The map cannot be closed while a view of it is alive.
+                view.release()
+
+
+def read_log(directory, sealed_only=False):
+    for path in segments(directory, sealed_only):
+        yield from read_segment(path)
+
+
+def tally(records, polls=None):
+    """Votes per ``(poll_id, choice_id)``."""
+    counts = Counter()
+    for _, poll_id, choice_id, _ in records:
+        if polls is None or poll_id in polls:
+            counts[poll_id, choice_id] += 1
+    return counts
+
+
+def voters(records, polls=None):
+    """Distinct voters per ``poll_id``."""
+    seen = set()
+    for _, poll_id, _, user_id in records:
+        if polls is None or poll_id in polls:
+            seen.add((poll_id, user_id))
+    return Counter(poll_id for poll_id, _ in seen)
+
+
+def log_start(directory):
+    """
+    When the earliest record of the log was logged, in microseconds since the
+    epoch, or ``None`` if the log is empty.
+    """
+    start = None
+    for path in segments(directory):
+        records = read_segment(path)
+        first = next(records, None)
+        records.close()
+        if first is not None and (start is None or first[0] < start):
+            start = first[0]
+    return start
+
+
+def compact(directory, keep_choice=None):
+    """
+    Merge the sealed segments of ``directory`` into as few segments of up to
+    ``POLLS_VOTE_LOG_SEGMENT_SIZE`` bytes as possible, dropping the records
+    for which ``keep_choice(choice_id)`` is false. Return the number of
+    segments and records before and after. Only one compaction may run at a
+    time.
+    """
+    directory = Path(directory)
+    finish_compaction(directory)
+    sealed = segments(directory, sealed_only=True)
+    records = itertools.chain.from_iterable(map(read_segment, sealed))
+    kept = 0
+    merged = []
+    output = None
+    try:
+        for record in records:
+            if keep_choice is not None and not keep_choice(record[2]):
+                continue
+            if output is None:
+                name = f"votes-{time.time_ns()}-compacted-{len(merged)}.tmp"
+                output = open(directory / name, "xb")
+                output.write(MAGIC)
+                merged.append(Path(output.name))
+            output.write(RECORD.pack(*record))
+            kept += 1
+            if output.tell() >= settings.POLLS_VOTE_LOG_SEGMENT_SIZE:
+                _close_durably(output)
+                output = None
+    finally:
+        if output is not None:
+            _close_durably(output)
+
+    total = sum((path.stat().st_size - len(MAGIC)) // RECORD.size for path in sealed)
+    _write_manifest(
+        directory,
+        {
+            "inputs": [path.name for path in sealed],
+            "outputs": [path.name for path in merged],
+        },
+    )
+    finish_compaction(directory)
+    return {
+        "segments": (len(sealed), len(merged)),
+        "records": (total, kept),
+    }
+
+
+def finish_compaction(directory):
+    """
+    Complete the compaction a manifest describes, if any: remove its inputs,
+    then publish its outputs. Without a manifest, ``.tmp`` segments are the
+    unfinished outputs of a compaction that never got to write one.
+    """
+    directory = Path(directory)
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        for path in directory.glob("votes-*.tmp"):
+            path.unlink()
+        return
+
+    for name in manifest["inputs"]:
+        (directory / name).unlink(missing_ok=True)
+    _fsync_directory(directory)
+    for name in manifest["outputs"]:
+        path = directory / name
+        if path.exists():
+            path.rename(path.with_suffix(".log"))
+    _fsync_directory(directory)
+    (directory / MANIFEST).unlink()
+    _fsync_directory(directory)
+
+
+def _read_manifest(directory):
+    try:
+        return json.loads((Path(directory) / MANIFEST).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(directory, manifest):
+    # Renamed into place, so that a manifest is either whole or absent.
+    staged = directory / f"{MANIFEST}.new"
+    with open(staged, "w") as output:
+        json.dump(manifest, output)
+        output.flush()
+        os.fsync(output.fileno())
+    staged.rename(directory / MANIFEST)
+    _fsync_directory(directory)
+
+
+def _close_durably(output):
+    output.flush()
+    os.fsync(output.fileno())
+    output.close()
+
+
+def _fsync_directory(directory):
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def write_columnar(path, columns):
+    """
+    Write int64 ``columns`` (name to sequence) to a columnar file:
+    ``COLUMNAR_MAGIC``, the length of a JSON header as a little-endian
+    uint32, the header (row count, then each column's name, type and byte
+    offset from the end of the header), then each column as contiguous
+    little-endian int64 values.
+    """
+    arrays = {name: array("q", values) for name, values in columns.items()}
+    described, offset = [], 0
+    for name, values in arrays.items():
+        described.append({"name": name, "type": "int64", "offset": offset})
+        offset += len(values) * values.itemsize
+    rows = len(next(iter(arrays.values()), []))
+    header = json.dumps({"rows": rows, "columns": described}).encode()
+
+    with open(path, "wb") as output:
+        output.write(COLUMNAR_MAGIC)
+        output.write(struct.pack("<I", len(header)))
+        output.write(header)
+        for values in arrays.values():
+            if sys.byteorder == "big":
+                values.byteswap()
+            values.tofile(output)
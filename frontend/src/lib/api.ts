@@ -1,5 +1,15 @@
 import axios from "axios";
-import type { Poll, User, SignupFormData, UserStats } from "./types";
+import type {
+    Page,
+    Poll,
+    PollFilters,
+    PollPage,
+    User,
+    SignupFormData,
+    UserStats,
+    VoteCounts,
+    VoteHistogram,
+} from "./types";
 
 export const axiosPolls = axios.create({
     baseURL: "http://127.0.0.1:8000/polls/api/",
@@ -50,10 +60,41 @@ axiosPolls.interceptors.response.use(
     }
 );
 
-export async function fetchPolls(): Promise<Poll[]> {
-    const response = await axiosPolls.get("polls/");
-    const polls = response.data;
-    return polls;
+export async function fetchPolls(
+    filters: PollFilters = {}
+): Promise<PollPage> {
+    const response = await axiosPolls.get<Page<Poll>>("polls/", {
+        params: filters,
+    });
+    const { next } = response.data;
+    // Passed back as `filters.cursor` to fetch the following page.
+    const cursor = next ? new URL(next).searchParams.get("cursor") : null;
+    return { ...response.data, cursor };
+}
+
+export async function fetchVoteHistogram(
+    pollId: string,
+    resolution: VoteHistogram["resolution"] = "hour"
+): Promise<VoteHistogram> {
+    const response = await axiosPolls.get<VoteHistogram>(
+        `polls/${pollId}/histogram/`,
+        { params: { resolution } }
+    );
+    return response.data;
+}
+
+export async function fetchTrendingPolls(limit = 20): Promise<Poll[]> {
+    const response = await axiosPolls.get<Poll[]>("polls/trending/", {
+        params: { limit },
+    });
+    return response.data;
+}
+
+export async function searchPolls(q: string, page = 1): Promise<Page<Poll>> {
+    const response = await axiosPolls.get<Page<Poll>>("polls/search/", {
+        params: { q, page },
+    });
+    return response.data;
 }
 
 export async function fetchPoll(id: string): Promise<Poll | null> {
@@ -62,6 +103,22 @@ export async function fetchPoll(id: string): Promise<Poll | null> {
     return poll;
 }
 
+export function subscribeToPollResults(
+    id: string,
+    onCounts: (counts: VoteCounts, isSnapshot: boolean) => void
+): () => void {
+    const source = new EventSource(
+        `${axiosPolls.defaults.baseURL}polls/${id}/stream/`
+    );
+    source.addEventListener("snapshot", (event) =>
+        onCounts(JSON.parse(event.data).choices, true)
+    );
+    source.addEventListener("delta", (event) =>
+        onCounts(JSON.parse(event.data).choices, false)
+    );
+    return () => source.close();
+}
+
 export async function fetchUser(): Promise<User | null> {
     const response = await axiosPolls.get("auth/whoami/");
     const user = response.data;
@@ -78,12 +135,17 @@ export async function votePoll(
     choiceIds: string[]
 ): Promise<Poll> {
     const votes = choiceIds.map((c) => ({ poll: pollId, choice: c }));
-    const response = await axiosPolls.post(`polls/vote/`, votes);
+    // The key stays the same when the request is retried after a token refresh.
+    const response = await axiosPolls.post(`polls/vote/`, votes, {
+        headers: { "Idempotency-Key": crypto.randomUUID() },
+    });
     return response.data;
 }
 
 export async function createPoll(poll: Poll): Promise<Poll> {
-    const response = await axiosPolls.post("polls/create/", poll);
+    const response = await axiosPolls.post("polls/create/", poll, {
+        headers: { "Idempotency-Key": crypto.randomUUID() },
+    });
     return response.data;
 }
 
@@ -14,6 +14,29 @@ export type Poll = {
     isActive?: boolean;
     allowsMultipleChoices: boolean;
     user?: string;
+    totalVotes?: number;
+    uniqueVoters?: number;
+};
+
+export type PollFilters = {
+    status?: "active" | "expired";
+    owner?: string;
+    search?: string;
+    sort?: "newest" | "popular";
+    cursor?: string;
+};
+
+export type VoteCounts = Record<string, number>;
+
+export type Page<T> = {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+};
+
+export type PollPage = Page<Poll> & {
+    // Cursor of the next page, or null on the last one.
+    cursor: string | null;
 };
 
 export type User = {
@@ -63,3 +86,9 @@ export type UserStats = {
     totalVotes: number;
     dateJoined: string;
 };
+
+export type VoteHistogram = {
+    resolution: "minute" | "hour" | "day";
+    // Votes per choice id, in each bucket that received any.
+    buckets: { start: string; counts: Record<string, number> }[];
+};
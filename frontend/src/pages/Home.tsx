@@ -18,13 +18,16 @@ import { formatDeadlineDate } from "@/lib/utils";
 
 export default function Home() {
     const [polls, setPolls] = useState<Poll[]>([]);
+    const [cursor, setCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState<boolean>(true);
+    const [isLoadingMore, setIsLoadingMore] = useState<boolean>(false);
     const { isAuthenticated, user } = useAuth();
     useEffect(() => {
         const getPolls = async () => {
             try {
-                const data = await fetchPolls();
-                setPolls(data);
+                const page = await fetchPolls();
+                setPolls(page.results);
+                setCursor(page.cursor);
             } catch (error) {
                 console.error("Error fetching poll:", error);
             } finally {
@@ -35,6 +38,20 @@ export default function Home() {
         getPolls();
     }, []);
 
+    const loadMore = async () => {
+        if (!cursor) return;
+        setIsLoadingMore(true);
+        try {
+            const page = await fetchPolls({ cursor });
+            setPolls((loaded) => [...loaded, ...page.results]);
+            setCursor(page.cursor);
+        } catch (error) {
+            console.error("Error fetching polls:", error);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const userPolls = [];
 
     const otherPolls = [];
@@ -190,6 +207,18 @@ export default function Home() {
                     </div>
                 </div>
             )}
+
+            {cursor && (
+                <div className="flex justify-center mt-8">
+                    <Button
+                        variant="outline"
+                        onClick={loadMore}
+                        disabled={isLoadingMore}
+                    >
+                        {isLoadingMore ? "Loading..." : "Load more polls"}
+                    </Button>
+                </div>
+            )}
         </div>
     );
 }
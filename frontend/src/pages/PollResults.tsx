@@ -18,7 +18,7 @@ import {
     BarChart3,
 } from "lucide-react";
 import { PollResultsChart } from "../components/PollResultsChart";
-import { fetchPoll } from "@/lib/api";
+import { fetchPoll, subscribeToPollResults } from "@/lib/api";
 import { useEffect, useState } from "react";
 import { toast } from "sonner";
 import type { Poll, Choice } from "@/lib/types";
@@ -51,6 +51,30 @@ export default function PollResultsPage() {
         getPoll();
     }, [id]);
 
+    useEffect(() => {
+        if (!id) return;
+
+        return subscribeToPollResults(id, (counts, isSnapshot) => {
+            setPoll((poll) =>
+                poll
+                    ? {
+                          ...poll,
+                          choiceSet: poll.choiceSet.map((choice) => {
+                              const count = counts[String(choice.id)];
+                              if (count === undefined) return choice;
+                              return {
+                                  ...choice,
+                                  voteCount: isSnapshot
+                                      ? count
+                                      : (choice.voteCount || 0) + count,
+                              };
+                          }),
+                      }
+                    : poll
+            );
+        });
+    }, [id]);
+
     const handleShare = async () => {
         if (navigator.share) {
             try {
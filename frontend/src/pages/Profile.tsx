@@ -37,13 +37,18 @@ export default function Profile() {
     const [email, setEmail] = useState<string>(user?.email || "");
     const [userStats, setUserStats] = useState<UserStats>();
     const [userPolls, setUserPolls] = useState<Poll[]>();
+    const [cursor, setCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState<boolean>(true);
+    const [isLoadingMore, setIsLoadingMore] = useState<boolean>(false);
 
     useEffect(() => {
         const getUserStats = async () => {
             try {
-                const polls: Poll[] = await fetchPolls();
-                setUserPolls(polls);
+                const page = await fetchPolls({
+                    owner: user?.username,
+                });
+                setUserPolls(page.results);
+                setCursor(page.cursor);
                 const stats: UserStats = await fetchUserStats();
                 setUserStats(stats);
             } catch (error) {
@@ -55,6 +60,20 @@ export default function Profile() {
         getUserStats();
     }, []);
 
+    const loadMorePolls = async () => {
+        if (!cursor) return;
+        setIsLoadingMore(true);
+        try {
+            const page = await fetchPolls({ owner: user?.username, cursor });
+            setUserPolls((loaded) => [...(loaded || []), ...page.results]);
+            setCursor(page.cursor);
+        } catch (error) {
+            console.log(error);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const handleSave = () => {
         // In a real app, this would update the user profile via API
         console.log("Saving profile:", { name, email });
@@ -327,6 +346,20 @@ export default function Profile() {
                                     </div>
                                 ))}
                             </div>
+                            {cursor && (
+                                <div className="flex justify-center mt-4">
+                                    <Button
+                                        variant="outline"
+                                        size="sm"
+                                        onClick={loadMorePolls}
+                                        disabled={isLoadingMore}
+                                    >
+                                        {isLoadingMore
+                                            ? "Loading..."
+                                            : "Load more polls"}
+                                    </Button>
+                                </div>
+                            )}
                         </CardContent>
                     </Card>
                 </div>